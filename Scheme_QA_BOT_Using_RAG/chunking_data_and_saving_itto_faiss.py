@@ -1,8 +1,12 @@
 
+import os
 import csv
+import glob
+import pyarrow.parquet as pq
 from langchain_community.vectorstores import FAISS
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_core.documents import Document
+from near_duplicates import deduplicate_rows, write_report
 
 # Step 1: Load CSV file row-wise
 DATA_PATH = "output.csv"
@@ -21,9 +25,71 @@ def load_csv_file(data_path):
             documents.append(doc)
     return documents
 
-# Load CSV data
-documents = load_csv_file(data_path=DATA_PATH)
-print("Number of CSV rows processed (documents): ", len(documents))
+# Listings exported by the scraper, used instead of the CSV when present: every
+# data_<timestamp>_combined.parquet a crawl wrote (SINK_PARQUET), else listings.parquet, made
+# from other crawl output with
+#   python "../scrapper_app/converter(json_csv).py" ../scrapper_app/final.json listings.csv --parquet listings.parquet
+SCRAPER_OUTPUT = os.path.join("..", "scrapper_app", "output")
+PARQUET_PATHS = sorted(glob.glob(os.path.join(SCRAPER_OUTPUT, "data_*_combined.parquet")))
+if not PARQUET_PATHS and os.path.exists("listings.parquet"):
+    PARQUET_PATHS = ["listings.parquet"]
+# Columns to embed; None keeps all of them
+PARQUET_COLUMNS = None
+def load_parquet_files(data_paths, columns=None):
+    # A run may hold only part of the catalog (a resumed crawl, a subset), so every run is
+    # read oldest first and a scheme's rows from a newer run replace those from older ones
+    rows_by_scheme = {}
+    for data_path in data_paths:
+        # Memory-mapped, and only the requested columns are decoded
+        table = pq.read_table(data_path, columns=columns, memory_map=True)
+        run_rows = {}
+        for batch in table.to_batches():
+            for row in batch.to_pylist():
+                slug = row.pop("slug", None)
+                key = slug or row.get("URL") or (data_path, len(run_rows))
+                run_rows.setdefault(key, []).append((data_path, slug, row))
+        rows_by_scheme.update(run_rows)
+
+    documents = []
+    for row_num, (data_path, slug, row) in enumerate(
+            (entry for entries in rows_by_scheme.values() for entry in entries), start=1):
+        # List columns (Tags) are read back as lists
+        row = {key: ", ".join(value) if isinstance(value, list) else value for key, value in row.items()}
+        content = ", ".join(f"{key}: {value}" for key, value in row.items() if value is not None)
+        doc = Document(
+            page_content=content,
+            metadata={"source": data_path, "row_number": row_num, "slug": slug, "row_data": row}
+        )
+        documents.append(doc)
+    return documents
+
+# Load listing data
+if PARQUET_PATHS:
+    documents = load_parquet_files(PARQUET_PATHS, columns=PARQUET_COLUMNS)
+else:
+    documents = load_csv_file(data_path=DATA_PATH)
+print("Number of rows processed (documents): ", len(documents))
+
+# Step 1b: Drop near-duplicate schemes before anything is embedded
+DEDUP_THRESHOLD = 0.85  # Jaccard similarity of word 3-grams
+DEDUP_POLICY = "merge"  # "first", "longest" or "merge" (see near_duplicates.py)
+DEDUP_REPORT_PATH = "dedup_report.json"
+def deduplicate_documents(documents, threshold=DEDUP_THRESHOLD, policy=DEDUP_POLICY, report_path=DEDUP_REPORT_PATH):
+    rows = [doc.metadata["row_data"] for doc in documents]
+    kept, report = deduplicate_rows(rows, threshold=threshold, policy=policy)
+    write_report(report, report_path)
+    deduplicated = []
+    for index, row in kept:
+        doc = documents[index]
+        if row is not rows[index]:
+            # Merged with its duplicates: rebuild the content from the filled-in row
+            content = ", ".join(f"{key}: {value}" for key, value in row.items() if value is not None)
+            doc = Document(page_content=content, metadata=dict(doc.metadata, row_data=row))
+        deduplicated.append(doc)
+    return deduplicated
+
+documents = deduplicate_documents(documents)
+print("Number of documents after deduplication: ", len(documents))
 
 # Step 2: Display a sample of chunked data
 def display_sample_chunks(documents, num_samples=3):
@@ -0,0 +1,246 @@
+"""Near-duplicate scheme detection with MinHash signatures and LSH banding.
+
+Rows are shingled into word n-grams, and each row gets a MinHash
+signature. Rows whose signatures collide in any LSH band become candidate
+pairs. A candidate pair is a duplicate when the exact Jaccard similarity of
+its shingle sets reaches the threshold. Duplicates are grouped with
+union-find and each group is collapsed to one row by a merge policy:
+
+- ``first``: keep the earliest row.
+- ``longest``: keep the row with the most text.
+- ``merge``: keep the row with the most non-empty fields (ties go to the
+  longest) and fill its empty fields from the other rows in the group.
+
+Run on its own, it consolidates several CSV/Parquet exports into one
+deduplicated file and writes a JSON report:
+
+    python near_duplicates.py output.csv ../scrapper_app/final_output.csv --out deduped.csv
+"""
+import os
+import re
+import csv
+import json
+import zlib
+import argparse
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Columns that identify a row rather than describe the scheme
+KEY_COLUMNS = {"url", "slug", "row_number"}
+MERGE_POLICIES = ("first", "longest", "merge")
+
+_PRIME = (1 << 31) - 1
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text: str, size: int = 3) -> set:
+    """Hashed word ``size``-grams of lower-cased text (the words themselves for short texts)."""
+    words = _TOKEN.findall(text.lower())
+    if len(words) < size:
+        grams = words
+    else:
+        grams = (" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+    return {zlib.crc32(gram.encode("utf-8")) for gram in grams}
+
+
+def lsh_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """(bands, rows) with bands * rows <= num_perm whose S-curve midpoint is nearest ``threshold``."""
+    best = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        midpoint = (1 / bands) ** (1 / rows)
+        if best is None or abs(midpoint - threshold) < best[0]:
+            best = (abs(midpoint - threshold), bands, rows)
+    return best[1], best[2]
+
+
+class MinHasher:
+    """MinHash signatures from ``num_perm`` universal hash functions (fixed seed, so runs are repeatable)."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self._a = rng.randint(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, _PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_set: set) -> np.ndarray:
+        if not shingle_set:
+            return np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        values = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set)) % _PRIME
+        return ((np.outer(self._a, values) + self._b[:, None]) % _PRIME).min(axis=1)
+
+
+def row_text(row: Dict[str, Any], fields: Optional[Sequence[str]] = None) -> str:
+    """The descriptive text of a row: ``fields`` if given, else every non-key column."""
+    names = fields or [name for name in row if name.lower() not in KEY_COLUMNS]
+    return " ".join(str(row[name]) for name in names if row.get(name))
+
+
+def _filled(value: Any) -> bool:
+    return value is not None and str(value).strip() != ""
+
+
+def _pick(group: List[int], rows: List[Dict[str, Any]], texts: List[str], policy: str) -> int:
+    if policy == "first":
+        return group[0]
+    if policy == "longest":
+        return max(group, key=lambda i: (len(texts[i]), -i))
+    return max(group, key=lambda i: (sum(_filled(v) for v in rows[i].values()), len(texts[i]), -i))
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def deduplicate_rows(
+    rows: List[Dict[str, Any]],
+    threshold: float = 0.85,
+    policy: str = "merge",
+    fields: Optional[Sequence[str]] = None,
+    num_perm: int = 128,
+    shingle_size: int = 3,
+    key: Optional[str] = None,
+) -> Tuple[List[Tuple[int, Dict[str, Any]]], Dict[str, Any]]:
+    """Collapse near-duplicate rows.
+
+    Returns the surviving ``(index, row)`` pairs in input order (merged rows
+    are new dicts; the input is not modified) and a report of every group
+    that was collapsed. ``key`` names the column used to label rows in the
+    report; by default the first column.
+    """
+    if policy not in MERGE_POLICIES:
+        raise ValueError(f"Unknown merge policy {policy!r}; expected one of {MERGE_POLICIES}")
+    texts = [row_text(row, fields) for row in rows]
+    shingle_sets = [shingles(text, shingle_size) for text in texts]
+    hasher = MinHasher(num_perm)
+    bands, band_rows = lsh_bands(threshold, num_perm)
+
+    buckets: Dict[Tuple[int, bytes], List[int]] = {}
+    for i, shingle_set in enumerate(shingle_sets):
+        if not shingle_set:
+            continue
+        signature = hasher.signature(shingle_set)
+        for band in range(bands):
+            chunk = signature[band * band_rows:(band + 1) * band_rows].tobytes()
+            buckets.setdefault((band, chunk), []).append(i)
+
+    parent = list(range(len(rows)))
+    similarities: Dict[Tuple[int, int], float] = {}
+    candidates = 0
+    for members in buckets.values():
+        for n, i in enumerate(members):
+            for j in members[n + 1:]:
+                if (i, j) in similarities or _find(parent, i) == _find(parent, j):
+                    continue
+                candidates += 1
+                a, b = shingle_sets[i], shingle_sets[j]
+                similarity = len(a & b) / len(a | b)
+                similarities[(i, j)] = similarity
+                if similarity >= threshold:
+                    parent[_find(parent, j)] = _find(parent, i)
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(rows)):
+        groups.setdefault(_find(parent, i), []).append(i)
+
+    label = key or (next(iter(rows[0]), None) if rows else None)
+    kept: Dict[int, Dict[str, Any]] = {}
+    clusters = []
+    for group in groups.values():
+        winner = _pick(group, rows, texts, policy)
+        row = rows[winner]
+        if len(group) > 1:
+            filled = []
+            if policy == "merge":
+                row = dict(row)
+                for i in group:
+                    for name, value in rows[i].items():
+                        if not _filled(row.get(name)) and _filled(value):
+                            row[name] = value
+                            filled.append(name)
+            members = set(group)
+            pair_scores = [s for (i, j), s in similarities.items() if i in members and j in members and s >= threshold]
+            clusters.append({
+                "kept": {"index": winner, "label": rows[winner].get(label)},
+                "removed": [{"index": i, "label": rows[i].get(label)} for i in group if i != winner],
+                "min_similarity": round(min(pair_scores), 4) if pair_scores else None,
+                "filled_fields": sorted(set(filled)),
+            })
+        kept[winner] = row
+
+    report = {
+        "threshold": threshold,
+        "policy": policy,
+        "num_perm": num_perm,
+        "bands": bands,
+        "rows_per_band": band_rows,
+        "shingle_size": shingle_size,
+        "input_rows": len(rows),
+        "output_rows": len(kept),
+        "removed_rows": len(rows) - len(kept),
+        "candidate_pairs": candidates,
+        "clusters": sorted(clusters, key=lambda c: c["kept"]["index"]),
+    }
+    return sorted(kept.items()), report
+
+
+def write_report(report: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4, ensure_ascii=False)
+    print(f"Dedup: {report['input_rows']} -> {report['output_rows']} rows "
+          f"({len(report['clusters'])} duplicate groups); report written to {path}")
+
+
+def read_rows(path: str) -> List[Dict[str, Any]]:
+    """Rows of a CSV (UTF-8, or Windows-1252 as a fallback) or Parquet file.
+
+    List columns of a Parquet file (Tags) are joined into comma-separated text, as in the CSV.
+    """
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        return [{name: ", ".join(value) if isinstance(value, list) else value for name, value in row.items()}
+                for row in pq.read_table(path, memory_map=True).to_pylist()]
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        text = data.decode("cp1252", errors="replace")
+    return list(csv.DictReader(text.splitlines()))
+
+
+def _unify_columns(tables: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Concatenate tables whose headers differ only in case, using the first spelling seen."""
+    names: Dict[str, str] = {}
+    rows = []
+    for table in tables:
+        for row in table:
+            rows.append({names.setdefault(name.strip().lower(), name.strip()): value for name, value in row.items()})
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge listing exports and drop near-duplicate schemes.")
+    parser.add_argument("inputs", nargs="+", help="CSV or Parquet files")
+    parser.add_argument("--out", required=True, help="Deduplicated CSV to write")
+    parser.add_argument("--report", help="JSON report path (default: <out>.dedup.json)")
+    parser.add_argument("--threshold", type=float, default=0.85, help="Jaccard similarity of duplicates")
+    parser.add_argument("--policy", choices=MERGE_POLICIES, default="merge")
+    parser.add_argument("--fields", help="Comma-separated columns to compare (default: all but URL/slug)")
+    args = parser.parse_args()
+
+    rows = _unify_columns([read_rows(path) for path in args.inputs])
+    fields = [name.strip() for name in args.fields.split(",")] if args.fields else None
+    kept, report = deduplicate_rows(rows, args.threshold, args.policy, fields)
+    report["inputs"] = args.inputs
+    columns = list(dict.fromkeys(name for row in rows for name in row))
+    with open(args.out, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(row for _, row in kept)
+    write_report(report, args.report or f"{os.path.splitext(args.out)[0]}.dedup.json")
@@ -1,23 +1,49 @@
 import os
+import sys
 import random
 import time
 import re
 import json
 import logging
+from contextlib import ExitStack
 from datetime import datetime
-from typing import List, Type, Dict, Any
-from urllib.parse import urlparse
+from typing import List, Type, Dict, Any, Tuple, Iterable, Iterator, Optional
 
-import pandas as pd
-from bs4 import BeautifulSoup
 from pydantic import BaseModel, create_model
-import html2text
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from groq import Groq
+from dotenv import load_dotenv
+from openai import RateLimitError
+
+from catalog import manifest_urls
+from consent import ConsentJar, click_consent_button
+from crawl_journal import CrawlJournal, RecrawlReport
+from crawl_metrics import CrawlMetrics
+from driver_pool import DriverPool
+from fetch_cache import FetchCache
+from get_urls import iter_urls
+from html_markdown import clean_html, content_hash, html_to_markdown, markdown_converter, remove_urls
+from http_fetcher import REQUIRED_SECTIONS, AsyncHttpFetcher, has_required_sections
+from llm_cache import ExtractionCache, extraction_key
+from llm_client import AsyncLlmClient, MissingApiKey
+from listing_sink import ListingSink
+from llm_scheduler import LlmRateScheduler, RateLimitDeferred
+from markdown_pool import MarkdownPool
+from markdown_compactor import MarkdownCompactor
+from section_extractor import extract_sections, focus_markdown
+from page_readiness import PageBudget, wait_for_page_ready
+from pipeline import Stage, StagedPipeline
+from resource_blocking import ResourceBlocker
+
+# MarkdownPool's spawned workers re-import the script they were started from as
+# __mp_main__. They only convert HTML, so they skip the process-wide setup below.
+SPAWNED_WORKER = __name__ == "__mp_main__"
+
+if not SPAWNED_WORKER:
+    load_dotenv()  # GROQ_API_KEY and optional LLM_BASE_URL, e.g. from scrapper_app/.env
 
 # Configuration constants
 USER_AGENTS = [
@@ -27,6 +53,7 @@ USER_AGENTS = [
 ]
 
 HEADLESS_OPTIONS = [
+    "--headless=new",
     "--disable-gpu",
     "--disable-dev-shm-usage",
     "--window-size=1920,1080",
@@ -71,68 +98,217 @@ Your output must follow this exact JSON structure:
 }
 """
 
+# Fields SYSTEM_MESSAGE asks for; a narrower field list is spelled out in the user message
+SCHEME_FIELDS = [
+    "Scheme Name", "Ministries/Departments", "Target Beneficiaries", "Eligibility Criteria",
+    "Description & Benefits", "Application Process", "Tags",
+]
+
+# Appended to SYSTEM_MESSAGE when several pages share one request
+BATCH_SYSTEM_SUFFIX = """
+BATCH MODE: The page content holds several pages, each starting with a line
+"=== PAGE <n> | URL: <url> ===". Extract each page on its own and return:
+{
+  "results": [
+    {"URL": "<the page URL, copied exactly>", "listings": [ <listing as above> ]}
+  ]
+}
+Return exactly one entry per page, in the same order as the pages.
+"""
+
 USER_MESSAGE = "Extract the following information from this government scheme webpage content:\n\n"
 MODEL_NAME = "llama-3.1-70b-versatile"
+EXTRACTION_MODEL = "llama3-70b-8192"  # MODEL_NAME was decommissioned; this is the model actually called
 OUTPUT_FOLDER = "output"
+CACHE_FOLDER = ".scraper_cache"  # State reused across crawl runs
+CONSENT_COOKIE_PATH = os.path.join(CACHE_FOLDER, "consent_cookies.json")
+FETCH_CACHE_FOLDER = os.path.join(CACHE_FOLDER, "fetch")
+FETCH_CACHE_TTL = 24 * 3600  # Seconds a cached page is reused before revalidation
+FETCH_CACHE_MAX_MB = 500
+JOURNAL_PATH = os.path.join(CACHE_FOLDER, "crawl_journal.db")  # Per-URL crawl progress for resuming
+LLM_CACHE_PATH = os.path.join(CACHE_FOLDER, "llm_cache.db")  # Extraction results reused across runs
+LLM_CACHE_MAX_MB = 200
 MAX_SCROLLS = 5  # Increased to capture more content
 PAGE_LOAD_TIMEOUT = 30
+PAGE_READY_BUDGET = 15  # Seconds a page may spend in readiness, consent and scroll waits
+READY_QUIET_SECONDS = 0.5  # DOM/network quiet period that counts as "settled"
+SCROLL_SETTLE_SECONDS = 2  # Longest wait for lazy content after each scroll
 MAX_RETRIES = 3  # Number of retries for API calls
+POLITE_DELAY_SECONDS = (2, 5)  # Random pause after each request to the site
+# Groq limits for the extraction model; the scheduler corrects them from response headers and 429s
+LLM_RPM = 30
+LLM_RPD = 14400
+LLM_TPM = 6000
+LLM_TPD = 500000
+LLM_MAX_RATE_WAIT = 600  # Defer a page rather than wait longer than this for rate-limit budget
+LLM_PAGE_TOKEN_BUDGET = 3500  # Page content tokens per extraction request after compaction
+LLM_BATCH_SIZE = 4  # Pages packed into one request in batched mode
+LLM_BATCH_TOKEN_BUDGET = 5000  # Page content tokens per batched request
+LLM_COMPLETION_TOKENS_PER_PAGE = 600  # Reply tokens allowed per page in a request (listings average ~300)
+RULE_MIN_CONFIDENCE = 0.6  # Fields the section extractor is less sure of are sent to the model
+DRIVER_POOL_SIZE = 1  # Long-lived browsers shared across URLs
+DRIVER_MAX_PAGES = 50  # Recycle a browser after this many pages
+DRIVER_MAX_MEMORY_MB = 1500  # Recycle a browser whose Chrome processes exceed this RSS
+# Worker threads per stage when scrape_urls runs pipelined (fetch also sizes the driver pool)
+STAGE_WORKERS = {"fetch": 2, "markdown": 2, "extract": 4, "save": 1}
+STAGE_QUEUE_SIZE = 4  # Items buffered between stages before upstream workers block
+HTTP_FAST_PATH = True  # Try a plain HTTP GET before rendering a page in Chrome
+HTTP_MAX_CONNECTIONS = 8  # Keep-alive connections shared by the HTTP fast path
+METRICS_TEXTFILE = os.path.join(OUTPUT_FOLDER, "scraper.prom")  # Prometheus textfile written after each crawl
+SINK_PARQUET = True  # Also write listings as a columnar .parquet file keyed by slug
+BLOCK_RESOURCES = True  # Block resource types and third-party hosts in Chrome (see resource_blocking.py)
+BLOCKED_RESOURCE_TYPES = ["Image", "Font", "Stylesheet", "Media"]
+RESOURCE_ALLOWLIST = []  # Resource types or hosts (with subdomains) that are never blocked
+FIRST_PARTY_HOSTS = ["myscheme.gov.in"]  # Never learned as third-party hosts to block
+MARKDOWN_PROCESSES = 0  # Worker processes for HTML-to-markdown conversion (0: convert inline)
+MARKDOWN_CHUNK_SIZE = 8  # Pages converted per process-pool task
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "https://api.groq.com/openai/v1")  # Any OpenAI-compatible API
+LLM_MAX_CONCURRENCY = 4  # Extraction requests in flight at once
+LLM_REQUEST_TIMEOUT = 60  # Seconds before an extraction request is abandoned
+
+if not SPAWNED_WORKER:
+    # Set up logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[
+            logging.FileHandler("scraper.log"),
+            logging.StreamHandler(),
+        ],
+    )
+    logging.getLogger("httpx").setLevel(logging.WARNING)  # One line per LLM request is too chatty
+
+    # Shared by every browser so the cookie banner is handled once per crawl
+    CONSENT_JAR = ConsentJar(CONSENT_COOKIE_PATH)
+
+    # Shared by every extraction call so concurrent workers respect one set of budgets
+    LLM_SCHEDULER = LlmRateScheduler(LLM_RPM, LLM_RPD, LLM_TPM, LLM_TPD, max_wait=LLM_MAX_RATE_WAIT)
+
+    # One keep-alive connection pool for every extraction request
+    LLM_CLIENT = AsyncLlmClient(
+        os.getenv("GROQ_API_KEY"), LLM_BASE_URL, max_concurrency=LLM_MAX_CONCURRENCY, timeout=LLM_REQUEST_TIMEOUT
+    )
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("scraper.log"),
-        logging.StreamHandler(),
-    ],
-)
-
-def setup_selenium() -> webdriver.Chrome:
+    # Learns the site's boilerplate from every page it compacts during the run
+    COMPACTOR = MarkdownCompactor(token_budget=LLM_PAGE_TOKEN_BUDGET)
+
+    # Keeps Chrome from downloading images, fonts, stylesheets and trackers (None to load everything)
+    RESOURCE_BLOCKER = ResourceBlocker(
+        FIRST_PARTY_HOSTS, BLOCKED_RESOURCE_TYPES, allowlist=RESOURCE_ALLOWLIST
+    ) if BLOCK_RESOURCES else None
+
+def setup_selenium(user_data_dir: str = None) -> webdriver.Chrome:
     """Configure Selenium WebDriver with random user agent and headless options."""
     options = Options()
     options.add_argument(f"user-agent={random.choice(USER_AGENTS)}")
     for option in HEADLESS_OPTIONS:
         options.add_argument(option)
+    if user_data_dir:
+        options.add_argument(f"--user-data-dir={user_data_dir}")
     options.page_load_timeout = PAGE_LOAD_TIMEOUT
-    return webdriver.Chrome(options=options)
+    if RESOURCE_BLOCKER:
+        for name, value in RESOURCE_BLOCKER.capabilities().items():
+            options.set_capability(name, value)
+    driver = webdriver.Chrome(options=options)
+    if RESOURCE_BLOCKER:
+        RESOURCE_BLOCKER.apply(driver)
+    return driver
 
-def click_cookie_consent(driver: webdriver.Chrome):
-    """Attempt to click a cookie consent button if present."""
+def click_cookie_consent(driver: webdriver.Chrome, budget: PageBudget = None) -> float:
+    """Click a cookie consent button if present, at most once per crawl.
+
+    Detection and the click happen in a single script call. Once consent has
+    been handled its cookies live in ``CONSENT_JAR`` and later pages (and later
+    runs) skip this entirely. Returns the seconds spent waiting after a click.
+    """
+    if CONSENT_JAR.handled:
+        return 0.0
     try:
-        WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-        consent_patterns = ["accept", "agree", "allow", "consent", "continue", "ok", "got it"]
-        for pattern in consent_patterns:
-            for tag in ["button", "a", "div"]:
-                elements = driver.find_elements(
-                    By.XPATH,
-                    f"//{tag}[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{pattern}')]",
-                )
-                for element in elements:
-                    if element.is_displayed() and element.is_enabled():
-                        element.click()
-                        logging.info(f"Clicked '{pattern}' cookie consent button")
-                        time.sleep(2)
-                        return
-        logging.info("No cookie consent button found")
+        pattern = click_consent_button(driver)
+        if pattern is None:
+            # Not marked handled: the banner may only appear on a later page
+            logging.info("No cookie consent button found")
+            return 0.0
+        logging.info(f"Clicked '{pattern}' cookie consent button")
+        remaining = budget.remaining() if budget else SCROLL_SETTLE_SECONDS
+        settle = min(SCROLL_SETTLE_SECONDS, remaining)
+        waited = wait_for_page_ready(driver, [], settle, READY_QUIET_SECONDS)["waited"]
+        CONSENT_JAR.mark_handled(driver)
+        return waited
     except Exception as e:
         logging.warning(f"Error handling cookie consent: {e}")
+    return 0.0
 
-def fetch_html_selenium(url: str) -> str:
-    """Fetch HTML content from a URL using Selenium with human-like behavior."""
-    driver = setup_selenium()
+def fetch_html_selenium(
+    url: str,
+    pool: DriverPool = None,
+    telemetry: Dict[str, Any] = None,
+    cache: FetchCache = None,
+) -> str:
+    """Fetch HTML content from a URL using Selenium with human-like behavior.
+
+    With a ``pool`` the page is rendered in a leased long-lived browser;
+    without one a browser is started and quit just for this URL. Wait
+    timings are recorded into ``telemetry`` when a dict is passed. With a
+    ``cache`` a fresh cached copy is returned without opening a browser.
+    """
+    if cache is not None:
+        html = cache.get(url)
+        if html:
+            logging.info(f"Using cached HTML for {url}")
+            return html
+
+    if pool is not None:
+        with pool.lease() as driver:
+            html = render_page(driver, url, telemetry)
+    else:
+        driver = setup_selenium()
+        try:
+            html = render_page(driver, url, telemetry)
+        finally:
+            driver.quit()
+
+    if cache is not None:
+        cache.put(url, html)
+    return html
+
+def render_page(driver: webdriver.Chrome, url: str, telemetry: Dict[str, Any] = None) -> str:
+    """Load a URL in an existing browser, scroll it and return the page source.
+
+    Instead of fixed sleeps, every wait ends as soon as the DOM and network
+    settle (or the target sections appear), all within ``PAGE_READY_BUDGET``.
+    With ``RESOURCE_BLOCKER`` the page's bytes transferred, requests and
+    blocked requests are recorded too.
+    """
+    waits = telemetry if telemetry is not None else {}
+    budget = PageBudget(PAGE_READY_BUDGET)
     try:
         logging.info(f"Fetching URL: {url}")
+        CONSENT_JAR.sync(driver)
+        if RESOURCE_BLOCKER:
+            RESOURCE_BLOCKER.apply(driver)
+            RESOURCE_BLOCKER.reset_log(driver)
+        started = time.perf_counter()
         driver.get(url)
-        time.sleep(3)  # Increased wait time for page load
+        waits["load"] = time.perf_counter() - started
+        ready = wait_for_page_ready(driver, REQUIRED_SECTIONS, budget.remaining(), READY_QUIET_SECONDS)
+        waits["ready_wait"] = ready["waited"]
+        waits["ready_reason"] = ready["reason"]
         driver.maximize_window()
-        click_cookie_consent(driver)
+        waits["consent_wait"] = click_cookie_consent(driver, budget)
 
         # Scroll to load dynamic content
+        waits["scroll_wait"] = 0.0
+        waits["scrolls"] = 0
         last_height = driver.execute_script("return document.body.scrollHeight")
         for i in range(MAX_SCROLLS):
+            if not budget.remaining():
+                logging.info(f"Stopped scrolling after {i} scrolls: page budget exhausted")
+                break
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
+            settle = min(SCROLL_SETTLE_SECONDS, budget.remaining())
+            waits["scroll_wait"] += wait_for_page_ready(driver, [], settle, READY_QUIET_SECONDS)["waited"]
+            waits["scrolls"] = i + 1
             new_height = driver.execute_script("return document.body.scrollHeight")
             if new_height == last_height:
                 logging.info(f"Stopped scrolling after {i+1} scrolls: no new content")
@@ -140,106 +316,191 @@ def fetch_html_selenium(url: str) -> str:
             last_height = new_height
 
         # Wait for main content to load
-        WebDriverWait(driver, 10).until(
+        WebDriverWait(driver, max(budget.remaining(), 1)).until(
             EC.presence_of_element_located((By.TAG_NAME, "main"))
         )
-        
-        return driver.page_source
+        waits["total"] = time.perf_counter() - started
+        logging.info(
+            f"Page ready in {waits['total']:.1f}s (load {waits['load']:.1f}s, "
+            f"ready {waits['ready_wait']:.1f}s [{waits['ready_reason']}], "
+            f"consent {waits['consent_wait']:.1f}s, scroll {waits['scroll_wait']:.1f}s)"
+        )
+        html = driver.page_source
+        if RESOURCE_BLOCKER:
+            network = RESOURCE_BLOCKER.collect(driver, url, waits)
+            if network:
+                logging.info(
+                    f"Transferred {network['bytes_transferred'] / 1024:.0f} KiB in {network['requests']} requests "
+                    f"({network['requests_blocked']} blocked)"
+                )
+        return html
     except Exception as e:
         logging.error(f"Error fetching {url}: {e}")
         return ""
-    finally:
-        driver.quit()
 
-def clean_html(html_content: str) -> str:
-    """Remove headers, footers, scripts, and styles from HTML but keep main content."""
+def fetch_html(
+    url: str,
+    pool: DriverPool = None,
+    http_fetcher: AsyncHttpFetcher = None,
+    telemetry: Dict[str, Any] = None,
+    cache: FetchCache = None,
+    revalidate: bool = False,
+) -> str:
+    """Fetch a page over plain HTTP when possible, falling back to Selenium.
+
+    The browserless response is only used if its <main> already holds every
+    section in ``REQUIRED_SECTIONS``; otherwise the page is rendered in Chrome.
+    Either way the result goes into ``cache``, which is consulted first. With
+    ``revalidate`` a cached copy is only used if the origin confirms it is
+    not modified, however recent it is. A complete page returned by that
+    revalidation request replaces the cached copy instead of being fetched again.
+    """
+    telemetry = telemetry if telemetry is not None else {}
+    if cache is not None:
+        html = cache.get(url, revalidate=revalidate, accept=has_required_sections)
+        if html:
+            logging.info(f"Using cached HTML for {url}")
+            telemetry["fetcher"] = "cache"
+            return html
+
+    if http_fetcher is not None:
+        page = http_fetcher.fetch(url)
+        if page is not None and page.status == 200 and has_required_sections(page.html):
+            logging.info(f"Fetched {url} over HTTP without a browser")
+            telemetry["fetcher"] = "http"
+            if cache is not None:
+                cache.put(url, page.html, page.headers)
+            return page.html
+        logging.info(f"HTTP response for {url} is incomplete, rendering with Selenium")
+    telemetry["fetcher"] = "selenium"
+    html = fetch_html_selenium(url, pool=pool, telemetry=telemetry)
+    if cache is not None:
+        cache.put(url, html)
+    return html
+
+def add_telemetry(telemetry: Dict[str, Any], key: str, amount: float = 1) -> None:
+    """Add to a counter in a per-page telemetry dict, if one was passed."""
+    if telemetry is not None:
+        telemetry[key] = telemetry.get(key, 0) + amount
+
+def request_completion(
+    messages: List[Dict[str, str]], model: str, telemetry: Dict[str, Any] = None, pages: int = 1
+) -> str:
+    """Send one chat completion within the rate-limit budget and return the reply text.
+
+    The reply is capped at ``LLM_COMPLETION_TOKENS_PER_PAGE`` tokens for each
+    of the ``pages`` pages in the request. Raises RateLimitDeferred if the budget will not free up within
+    ``LLM_MAX_RATE_WAIT``, and RateLimitError (after updating the scheduler) on a 429.
+    Requests, token usage, 429s and rate-limit waits are added to ``telemetry``.
+    """
+    # Wait for rate-limit budget instead of sending a request that will 429
+    estimated_tokens = LLM_SCHEDULER.estimate_tokens(messages, pages)
+    add_telemetry(telemetry, "rate_limit_wait", LLM_SCHEDULER.acquire(estimated_tokens))
+    add_telemetry(telemetry, "llm_requests")
+
     try:
-        soup = BeautifulSoup(html_content, "html.parser")
-        
-        # Try to focus on main content (improved targeting)
-        main_content = soup.find("main") or soup.find(id=re.compile("content|main", re.I)) or soup.find(class_=re.compile("content|main", re.I))
-        
-        # If found main content, use it instead of the whole page
-        if main_content:
-            return str(main_content)
-            
-        # Otherwise clean the whole page
-        for element in soup.find_all(["script", "style", "nav", "footer"]):
-            element.decompose()
-        
-        return str(soup)
-    except Exception as e:
-        logging.error(f"Error cleaning HTML: {e}")
-        return html_content
+        completion = LLM_CLIENT.complete(
+            messages,
+            model,
+            temperature=0.2,  # Lower temperature for more consistent outputs
+            max_tokens=LLM_COMPLETION_TOKENS_PER_PAGE * pages,  # Room for every page's listing
+        )
+    except RateLimitError as e:
+        # The scheduler now knows when budget frees up; the next attempt waits for it
+        LLM_SCHEDULER.update_from_error(str(e), e.response.headers)
+        add_telemetry(telemetry, "rate_limited")
+        raise
+    LLM_SCHEDULER.update_from_headers(completion.headers)
+    LLM_SCHEDULER.record_usage(estimated_tokens, completion.total_tokens)
+    add_telemetry(telemetry, "prompt_tokens", completion.prompt_tokens or 0)
+    add_telemetry(telemetry, "completion_tokens", completion.completion_tokens or 0)
 
-def remove_urls(text: str) -> str:
-    """Remove URLs from text using regex."""
-    url_pattern = r"http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+"
-    return re.sub(url_pattern, "", text)
+    response_content = completion.content
 
-def html_to_markdown(html_content: str) -> str:
-    """Convert cleaned HTML to markdown and remove URLs."""
-    if not html_content:
-        return ""
-    cleaned_html = clean_html(html_content)
-    converter = html2text.HTML2Text()
-    converter.ignore_links = False  # Keep links for context
-    converter.ignore_images = True
-    converter.body_width = 0  # Don't wrap text
-    markdown = converter.handle(cleaned_html)
-    
-    # Some basic cleaning to improve readability
-    markdown = re.sub(r'\n{3,}', '\n\n', markdown)  # Remove excessive newlines
-    markdown = remove_urls(markdown)
-    
-    return markdown
+    # Debug the raw response
+    logging.debug(f"Raw model response: {response_content[:200]}...")
+    return response_content
+
+def parse_model_json(response_content: str) -> Dict[str, Any]:
+    """Parse the JSON object in a model reply, ignoring any text around it."""
+    # Try to extract JSON from the response (handle cases where there's text before/after JSON)
+    json_match = re.search(r'({[\s\S]*})', response_content)
+    if json_match:
+        response_content = json_match.group(1)
+    return json.loads(response_content)
 
-def extract_data_from_model(markdown: str, fields: List[str], url: str) -> Dict[str, Any]:
-    """Extract structured data from markdown using Groq's API with error handling and retry logic."""
+def normalize_listings(listings: List[Dict[str, Any]], fields: List[str], url: str) -> None:
+    """Make sure every listing has all expected fields and its source URL."""
+    for listing in listings:
+        for field in fields:
+            if field not in listing:
+                listing[field] = None
+
+        # Add source URL to each listing
+        listing["URL"] = url
+
+def extraction_prompt(fields: List[str], content: str) -> str:
+    """User message for an extraction request, naming the fields when only some are wanted."""
+    user_content = f"{USER_MESSAGE}{content}"
+    if set(fields) != set(SCHEME_FIELDS):
+        user_content = f"Only extract these fields: {', '.join(fields)}\n\n{user_content}"
+    return user_content
+
+def extract_data_from_model(
+    markdown: str,
+    fields: List[str],
+    url: str,
+    cache: ExtractionCache = None,
+    compact: bool = True,
+    telemetry: Dict[str, Any] = None,
+    observe: bool = True,
+) -> Dict[str, Any]:
+    """Extract structured data from markdown using Groq's API with error handling and retry logic.
+
+    With a ``cache`` a page whose markdown, prompt, model and fields were all
+    seen before is answered from disk without calling the model. Pass
+    ``compact=False`` for markdown that has already been through ``COMPACTOR``,
+    and ``observe=False`` for an excerpt of a page the compactor already saw.
+    LLM usage and retries are added to ``telemetry`` when a dict is passed.
+    """
     if not markdown:
         logging.warning("No markdown content to extract data from")
         return {"listings": []}
         
     retries = 0
+    current_model = EXTRACTION_MODEL
+
+    cache_key = None
+    if cache is not None:
+        cache_key = extraction_key(markdown, SYSTEM_MESSAGE, current_model, fields)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logging.info(f"Using cached extraction for {url}")
+            add_telemetry(telemetry, "llm_cache_hits")
+            for listing in cached["listings"]:
+                listing["URL"] = url
+            return cached
     
-    # Replace the decommissioned model with a current one
-    current_model = "llama3-70b-8192"  # Updated to a currently available Groq model
+    if compact:
+        # Drop site boilerplate and the least relevant sections to fit the token budget
+        markdown, compaction = COMPACTOR.compact(markdown, fields, observe=observe)
+        logging.info(
+            f"Compacted {url} from {compaction['tokens_before']} to {compaction['tokens_after']} tokens "
+            f"({compaction['boilerplate_lines']} boilerplate lines, dropped: {', '.join(compaction['dropped_sections']) or 'none'})"
+        )
     
     while retries < MAX_RETRIES:
         try:
-            # Trim content if too long (model context limits)
-            if len(markdown) > 24000:
-                logging.info(f"Trimming content from {len(markdown)} to 24000 characters")
-                markdown = markdown[:24000]
-            
             # Prepare user message with URL for context
-            user_content = f"{USER_MESSAGE}\nURL: {url}\n\nPage content:\n{markdown}"
-            
-            client = Groq(api_key="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")
-            
-            # Add temperature and retry
-            completion = client.chat.completions.create(
-                model=current_model,  # Using updated model
-                messages=[
-                    {"role": "system", "content": SYSTEM_MESSAGE},
-                    {"role": "user", "content": user_content},
-                ],
-                temperature=0.2,  # Lower temperature for more consistent outputs
-                max_tokens=2048,   # Ensure enough tokens for response
-            )
-
-            response_content = completion.choices[0].message.content
-            
-            # Debug the raw response
-            logging.info(f"Raw model response: {response_content[:200]}...")
-            
-            # Try to extract JSON from the response (handle cases where there's text before/after JSON)
-            json_match = re.search(r'({[\s\S]*})', response_content)
-            if json_match:
-                response_content = json_match.group(1)
+            user_content = extraction_prompt(fields, f"\nURL: {url}\n\nPage content:\n{markdown}")
+            messages = [
+                {"role": "system", "content": SYSTEM_MESSAGE},
+                {"role": "user", "content": user_content},
+            ]
+            response_content = request_completion(messages, current_model, telemetry)
             
             # Parse the JSON response
-            parsed_response = json.loads(response_content)
+            parsed_response = parse_model_json(response_content)
             
             # Validate the response structure
             if "listings" not in parsed_response:
@@ -252,20 +513,34 @@ def extract_data_from_model(markdown: str, fields: List[str], url: str) -> Dict[
                 parsed_response = {"listings": [listing]}
                 
             # Make sure listings contains all expected fields
-            for listing in parsed_response["listings"]:
-                for field in fields:
-                    if field not in listing:
-                        listing[field] = None
-                
-                # Add source URL to each listing
-                listing["URL"] = url
+            normalize_listings(parsed_response["listings"], fields, url)
+
+            if cache is not None and parsed_response["listings"]:
+                cache.put(cache_key, parsed_response, current_model, url)
                 
             return parsed_response
             
+        except RateLimitDeferred as e:
+            logging.warning(f"Deferring extraction for {url}: {e}")
+            return {"listings": []}
+
+        except MissingApiKey as e:
+            # Retrying cannot help; pages resolved without the model are unaffected
+            logging.error(f"Cannot extract {url} with the model: {e} (set GROQ_API_KEY)")
+            return {"listings": []}
+
+        except RateLimitError as e:
+            logging.error(f"Rate limited extracting data: {e}")
+            retries += 1
+            if retries < MAX_RETRIES:
+                add_telemetry(telemetry, "llm_retries")
+                logging.info(f"Retrying extraction ({retries}/{MAX_RETRIES})...")
+
         except json.JSONDecodeError as e:
             logging.error(f"Invalid JSON response from model: {e}")
             retries += 1
             if retries < MAX_RETRIES:
+                add_telemetry(telemetry, "llm_retries")
                 logging.info(f"Retrying extraction ({retries}/{MAX_RETRIES})...")
                 time.sleep(2)
             
@@ -273,6 +548,7 @@ def extract_data_from_model(markdown: str, fields: List[str], url: str) -> Dict[
             logging.error(f"Error extracting data: {e}")
             retries += 1
             if retries < MAX_RETRIES:
+                add_telemetry(telemetry, "llm_retries")
                 logging.info(f"Retrying extraction ({retries}/{MAX_RETRIES})...")
                 time.sleep(2)
     
@@ -280,81 +556,618 @@ def extract_data_from_model(markdown: str, fields: List[str], url: str) -> Dict[
     logging.warning("All extraction attempts failed")
     return {"listings": []}
 
-def save_data(data: dict, timestamp: str, url: str = "combined") -> None:
-    """Save extracted data to JSON and CSV files."""
-    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
-    filename = f"data_{timestamp}_{urlparse(url).netloc if url != 'combined' else 'combined'}"
+def pack_batches(pages: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """Group pages into batches of at most ``LLM_BATCH_SIZE`` pages and ``LLM_BATCH_TOKEN_BUDGET`` tokens."""
+    batches, current, tokens = [], [], 0
+    for page in pages:
+        if current and (len(current) >= LLM_BATCH_SIZE or tokens + page["tokens"] > LLM_BATCH_TOKEN_BUDGET):
+            batches.append(current)
+            current, tokens = [], 0
+        current.append(page)
+        tokens += page["tokens"]
+    if current:
+        batches.append(current)
+    return batches
 
-    # Save JSON
-    json_path = os.path.join(OUTPUT_FOLDER, f"{filename}.json")
-    try:
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
-        logging.info(f"Saved JSON to {json_path}")
-    except Exception as e:
-        logging.error(f"Error saving JSON to {json_path}: {e}")
+def extract_batch_from_model(
+    pages: List[Tuple[str, str]],
+    fields: List[str],
+    cache: ExtractionCache = None,
+    telemetry: Dict[str, Any] = None,
+    observe: bool = True,
+    page_fields: Dict[str, List[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Extract several pages with as few model requests as possible; returns data per URL.
+
+    ``page_fields`` narrows the fields wanted from individual URLs (default:
+    ``fields``); each page is cached under its own fields, and a batched
+    request asks for the fields of the pages in it.
 
-    # Save CSV
-    listings = data.get("listings", [])
-    if listings:
+    Cached pages are answered from disk. The rest are compacted and packed
+    into multi-page requests (see ``pack_batches``), each page tagged with its
+    URL. Pages missing from a reply, or a reply that is not valid JSON, are
+    retried in smaller batches until single pages fall back to
+    ``extract_data_from_model``. LLM usage of all requests is added to
+    ``telemetry`` when a dict is passed. ``observe`` is passed on to
+    ``COMPACTOR.compact``.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    pending = []
+    for url, markdown in pages:
+        if not markdown:
+            results[url] = {"listings": []}
+            continue
+        wanted = page_fields.get(url, fields) if page_fields else fields
+        key = extraction_key(markdown, SYSTEM_MESSAGE, EXTRACTION_MODEL, wanted) if cache is not None else None
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None:
+            logging.info(f"Using cached extraction for {url}")
+            add_telemetry(telemetry, "llm_cache_hits")
+            normalize_listings(cached["listings"], wanted, url)
+            results[url] = cached
+            continue
+        compacted, compaction = COMPACTOR.compact(markdown, wanted, observe=observe)
+        pending.append(
+            {"url": url, "markdown": compacted, "fields": wanted, "key": key, "tokens": compaction["tokens_after"]}
+        )
+
+    for batch in pack_batches(pending):
+        results.update(extract_model_batch(batch, cache, telemetry))
+    return results
+
+def extract_model_batch(
+    batch: List[Dict[str, Any]], cache: ExtractionCache = None, telemetry: Dict[str, Any] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Send one multi-page request, splitting and retrying whatever comes back malformed."""
+    if len(batch) == 1:
+        page = batch[0]
+        data = extract_data_from_model(
+            page["markdown"], page["fields"], page["url"], compact=False, telemetry=telemetry
+        )
+        if cache is not None and data["listings"]:
+            cache.put(page["key"], data, EXTRACTION_MODEL, page["url"])
+        return {page["url"]: data}
+
+    fields: List[str] = []
+    for page in batch:
+        fields.extend(field for field in page["fields"] if field not in fields)
+    content = "\n\n".join(
+        f"=== PAGE {n} | URL: {page['url']} ===\n{page['markdown']}" for n, page in enumerate(batch, start=1)
+    )
+    messages = [
+        {"role": "system", "content": SYSTEM_MESSAGE + BATCH_SYSTEM_SUFFIX},
+        {"role": "user", "content": extraction_prompt(fields, f"\n{content}")},
+    ]
+    logging.info(f"Extracting {len(batch)} pages in one request")
+    by_url = {}
+    for attempt in range(MAX_RETRIES):
         try:
-            df = pd.DataFrame(listings)
-            csv_path = os.path.join(OUTPUT_FOLDER, f"{filename}.csv")
-            df.to_csv(csv_path, index=False)
-            logging.info(f"Saved CSV to {csv_path}")
+            parsed = parse_model_json(request_completion(messages, EXTRACTION_MODEL, telemetry, pages=len(batch)))
+            by_url = {
+                entry.get("URL"): entry for entry in parsed.get("results", []) if isinstance(entry, dict)
+            }
+            break
+        except RateLimitDeferred as e:
+            logging.warning(f"Deferring extraction of {len(batch)} pages: {e}")
+            return {page["url"]: {"listings": []} for page in batch}
+        except MissingApiKey as e:
+            logging.error(f"Cannot extract {len(batch)} pages with the model: {e} (set GROQ_API_KEY)")
+            return {page["url"]: {"listings": []} for page in batch}
+        except RateLimitError as e:
+            logging.error(f"Rate limited extracting batch: {e}")
+            add_telemetry(telemetry, "llm_retries")
         except Exception as e:
-            logging.error(f"Error saving CSV to {csv_path}: {e}")
+            logging.error(f"Malformed batch response for {len(batch)} pages: {e}")
+            break
     else:
-        logging.warning(f"No data to save for {url}")
+        logging.warning(f"Rate limits persisted; deferring {len(batch)} pages")
+        return {page["url"]: {"listings": []} for page in batch}
 
-def scrape_urls(urls: List[str], fields: List[str]) -> None:
-    """Scrape multiple URLs, extract fields, and save results."""
-    if not urls or not fields:
-        logging.error("URLs and fields must not be empty")
-        return
+    results, retry = {}, []
+    for page in batch:
+        listings = by_url.get(page["url"], {}).get("listings")
+        if isinstance(listings, list) and listings and all(isinstance(item, dict) for item in listings):
+            if page["fields"] != fields:
+                # Cache only what this page asked for, matching its key
+                listings = [{field: item.get(field) for field in page["fields"]} for item in listings]
+            data = {"listings": listings}
+            normalize_listings(listings, page["fields"], page["url"])
+            if cache is not None:
+                cache.put(page["key"], data, EXTRACTION_MODEL, page["url"])
+            results[page["url"]] = data
+        else:
+            retry.append(page)
 
-    all_data = {"listings": []}
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if retry:
+        logging.info(f"Retrying {len(retry)}/{len(batch)} pages missing from the batch response")
+        if len(retry) == len(batch):
+            middle = len(batch) // 2
+            results.update(extract_model_batch(batch[:middle], cache, telemetry))
+            results.update(extract_model_batch(batch[middle:], cache, telemetry))
+        else:
+            results.update(extract_model_batch(retry, cache, telemetry))
+    return results
+
+def apply_rules(markdown: str, fields: List[str]) -> Tuple[Dict[str, Any], Dict[str, float], List[str]]:
+    """Run the section parser; returns the listing, its confidence and the fields left for the model."""
+    listing, confidence = extract_sections(markdown, fields)
+    missing = [field for field in fields if confidence[field] < RULE_MIN_CONFIDENCE]
+    return listing, confidence, missing
+
+def merge_model_fields(
+    listing: Dict[str, Any],
+    confidence: Dict[str, float],
+    missing: List[str],
+    model_data: Dict[str, Any],
+    fields: List[str],
+    url: str,
+) -> Dict[str, Any]:
+    """Fill the fields the parser missed from a model result and build the page's data."""
+    sources = {field: "rules" for field in fields}
+    model_listing = model_data["listings"][0] if model_data.get("listings") else {}
+    for field in missing:
+        if model_listing.get(field):
+            listing[field] = model_listing[field]
+            confidence[field] = 1.0
+            sources[field] = "llm"
+        else:
+            listing[field] = None
+            confidence[field] = 0.0
+            sources[field] = "missing"
+
+    if not any(listing.get(field) for field in fields):
+        return {"listings": []}
+    listing["URL"] = url
+    return {"listings": [listing], "confidence": confidence, "sources": sources}
+
+def extract_listing(
+    markdown: str, fields: List[str], url: str, cache: ExtractionCache = None, telemetry: Dict[str, Any] = None
+) -> Dict[str, Any]:
+    """Extract a page's listing with the rule-based section parser, using the model only as a fallback.
+
+    Fields the parser resolves with at least ``RULE_MIN_CONFIDENCE`` are kept;
+    the rest are requested from ``extract_data_from_model`` using only the
+    page sections relevant to them. The result carries the usual ``listings``
+    plus per-field ``confidence`` and ``sources`` ("rules", "llm" or "missing").
+    """
+    if not markdown:
+        logging.warning("No markdown content to extract data from")
+        return {"listings": []}
+
+    # The model only sees focused excerpts, so learn boilerplate from the full page
+    COMPACTOR.observe(markdown)
+    listing, confidence, missing = apply_rules(markdown, fields)
+    model_data = {"listings": []}
+    if missing:
+        logging.info(f"Section parser left {len(missing)}/{len(fields)} fields for the model: {', '.join(missing)}")
+        model_data = extract_data_from_model(
+            focus_markdown(markdown, missing), missing, url, cache=cache, telemetry=telemetry, observe=False
+        )
+    else:
+        logging.info(f"Extracted all fields for {url} without calling the model")
+    return merge_model_fields(listing, confidence, missing, model_data, fields, url)
+
+def extract_listings_batch(
+    pages: List[Tuple[str, str]],
+    fields: List[str],
+    cache: ExtractionCache = None,
+    rule_based: bool = True,
+    telemetry: Dict[str, Any] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Batched counterpart of ``extract_listing``/``extract_data_from_model`` for several pages.
+
+    With ``rule_based`` only the fields the section parser could not resolve
+    are sent to the model, all pages in shared batched requests.
+    """
+    if not rule_based:
+        return extract_batch_from_model(pages, fields, cache, telemetry)
+
+    parsed, requests, needed = {}, [], {}
+    for url, markdown in pages:
+        if not markdown:
+            continue
+        COMPACTOR.observe(markdown)
+        parsed[url] = apply_rules(markdown, fields)
+        missing = parsed[url][2]
+        if missing:
+            requests.append((url, focus_markdown(markdown, missing)))
+            needed[url] = missing
+    model_results = {}
+    if requests:
+        model_results = extract_batch_from_model(
+            requests, fields, cache, telemetry, observe=False, page_fields=needed
+        )
+
+    results = {}
+    for url, _ in pages:
+        if url not in parsed:
+            results[url] = {"listings": []}
+            continue
+        listing, confidence, missing = parsed[url]
+        results[url] = merge_model_fields(
+            listing, confidence, missing, model_results.get(url, {"listings": []}), fields, url
+        )
+    return results
+
+def save_raw_markdown(markdown: str, timestamp: str, index: int) -> None:
+    """Save the markdown of one page for debugging."""
+    raw_path = os.path.join(OUTPUT_FOLDER, f"raw_{timestamp}_{index}.md")
+    try:
+        os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+        with open(raw_path, "w", encoding="utf-8") as f:
+            f.write(markdown)
+        logging.info(f"Saved raw markdown to {raw_path}")
+    except Exception as e:
+        logging.error(f"Error saving raw markdown to {raw_path}: {e}")
+
+class CrawlContext:
+    """Settings and shared resources used by the crawl steps of one scrape_urls run."""
+
+    def __init__(
+        self,
+        fields: List[str],
+        timestamp: str,
+        total: Optional[int],
+        pool: DriverPool = None,
+        http_fetcher: AsyncHttpFetcher = None,
+        cache: FetchCache = None,
+        journal: CrawlJournal = None,
+        llm_cache: ExtractionCache = None,
+        rule_based: bool = True,
+        sink: ListingSink = None,
+        markdown_pool: MarkdownPool = None,
+        metrics: CrawlMetrics = None,
+        recrawl: RecrawlReport = None,
+    ):
+        self.fields = fields
+        self.timestamp = timestamp
+        self.total = total
+        self.pool = pool
+        self.http_fetcher = http_fetcher
+        self.cache = cache
+        self.journal = journal
+        self.llm_cache = llm_cache
+        self.rule_based = rule_based
+        self.sink = sink
+        self.markdown_pool = markdown_pool
+        self.metrics = metrics
+        self.recrawl = recrawl
 
+def resume_job(job: Dict[str, Any], ctx: CrawlContext) -> bool:
+    """Pick up a job's finished stages from the journal; ``True`` if nothing is left to do.
+
+    In a recrawl every page is fetched again (a fetch cache entry is only
+    reused after a conditional GET says it is not modified); the journal
+    only supplies the previous content hash, whether that content was
+    already extracted and the listings extracted from it.
+    """
+    entry = ctx.journal.get(job["url"]) if ctx.journal else None
+    if ctx.recrawl:
+        ctx.recrawl.visit(job["url"])
+        job["previous_hash"] = entry["content_hash"] if entry else None
+        job["extracted"] = bool(entry) and entry["extract_state"] == "done"
+        job["listings"] = entry["listings"] if job["extracted"] else []
+        return False
+    if not entry:
+        return False
+    if entry["extract_state"] == "done":
+        logging.info(f"Skipping {job['url']}: already extracted in an earlier run")
+        ctx.sink.write(entry["listings"])
+        if ctx.metrics:
+            ctx.metrics.record(job["url"], "skipped", {})
+        return True
+    if entry["markdown_state"] == "done" and entry["markdown"]:
+        logging.info(f"Resuming {job['url']} at extraction")
+        job["markdown"] = entry["markdown"]
+    return False
+
+def fetch_step(job: Dict[str, Any], ctx: CrawlContext) -> Dict[str, Any]:
+    """Crawl stage 1: fetch the page HTML for a job (``None`` if nothing came back)."""
+    job["telemetry"] = {}
+    if "markdown" in job:
+        return job
+    position = f"{job['index']+1}/{ctx.total}" if ctx.total is not None else job["index"] + 1
+    logging.info(f"Processing URL {position}: {job['url']}")
+    started = time.perf_counter()
+    job["html"] = fetch_html(
+        job["url"], pool=ctx.pool, http_fetcher=ctx.http_fetcher, telemetry=job["telemetry"], cache=ctx.cache,
+        revalidate=ctx.recrawl is not None,
+    )
+    job["telemetry"]["fetch_seconds"] = time.perf_counter() - started
+    job["telemetry"]["bytes_fetched"] = len(job["html"].encode("utf-8")) if job["html"] else 0
+    if not job["html"]:
+        logging.warning(f"No HTML content retrieved for {job['url']}")
+        if ctx.journal:
+            ctx.journal.record(job["url"], "fetch", "failed", error="no HTML content")
+        if ctx.recrawl:
+            ctx.recrawl.add(job["url"], "failed")
+        if ctx.metrics:
+            ctx.metrics.record(job["url"], "fetch_failed", job["telemetry"])
+        return None
+    if ctx.journal:
+        ctx.journal.record(job["url"], "fetch", "done")
+    return job
+
+def record_markdown(job: Dict[str, Any], ctx: CrawlContext) -> bool:
+    """Save and journal a job's freshly converted markdown.
+
+    Returns ``False`` when a recrawl finds the page's content unchanged since
+    it was last extracted, so it need not be extracted (or indexed) again;
+    its journaled listings are written to the run's output instead.
+    """
+    job["telemetry"]["markdown_chars"] = len(job["markdown"])
+    save_raw_markdown(job["markdown"], ctx.timestamp, job["index"])
+    digest = content_hash(job["markdown"]) if job["markdown"] else None
+    if ctx.journal:
+        state = "done" if job["markdown"] else "failed"
+        ctx.journal.record(job["url"], "markdown", state, markdown=job["markdown"], content_hash=digest)
+    if ctx.recrawl and not digest:
+        ctx.recrawl.add(job["url"], "failed")
+    elif ctx.recrawl:
+        status = ctx.recrawl.classify(job["url"], job["previous_hash"], digest)
+        if status == "unchanged" and job["extracted"]:
+            logging.info(f"Content of {job['url']} is unchanged, reusing its listings from the journal")
+            ctx.sink.write(job["listings"])
+            if ctx.metrics:
+                ctx.metrics.record(job["url"], "unchanged", job["telemetry"])
+            return False
+    return True
+
+def markdown_step(job: Dict[str, Any], ctx: CrawlContext) -> Dict[str, Any]:
+    """Crawl stage 2: convert the fetched HTML to markdown (``None`` if it is unchanged)."""
+    if "markdown" in job:
+        return job
+    started = time.perf_counter()
+    job["markdown"] = html_to_markdown(job.pop("html"))
+    job["telemetry"]["markdown_seconds"] = time.perf_counter() - started
+    return job if record_markdown(job, ctx) else None
+
+def markdown_batch_step(jobs: List[Dict[str, Any]], ctx: CrawlContext) -> List[Dict[str, Any]]:
+    """Crawl stage 2, batched: convert several pages on the markdown process pool."""
+    pending = [job for job in jobs if "markdown" not in job]
+    started = time.perf_counter()
+    converted = ctx.markdown_pool.convert([job.pop("html") for job in pending])
+    elapsed = time.perf_counter() - started
+    unchanged = set()
+    for job, markdown in zip(pending, converted):
+        job["markdown"] = markdown
+        job["telemetry"]["markdown_seconds"] = elapsed
+        if not record_markdown(job, ctx):
+            unchanged.add(id(job))
+    return [None if id(job) in unchanged else job for job in jobs]
+
+def record_extraction(job: Dict[str, Any], ctx: CrawlContext) -> None:
+    """Journal the outcome of a job's extraction."""
+    if ctx.journal:
+        listings = job["data"].get("listings", [])
+        if listings:
+            ctx.journal.record(job["url"], "extract", "done", listings=listings)
+        else:
+            ctx.journal.record(job["url"], "extract", "failed", error="no listings extracted")
+
+def extract_step(job: Dict[str, Any], ctx: CrawlContext) -> Dict[str, Any]:
+    """Crawl stage 3: extract the listing fields from the markdown."""
+    extract = extract_listing if ctx.rule_based else extract_data_from_model
+    started = time.perf_counter()
+    job["data"] = extract(
+        job.pop("markdown"), ctx.fields, job["url"], cache=ctx.llm_cache, telemetry=job["telemetry"]
+    )
+    job["telemetry"]["extract_seconds"] = time.perf_counter() - started
+    record_extraction(job, ctx)
+    return job
+
+def extract_batch_step(jobs: List[Dict[str, Any]], ctx: CrawlContext) -> List[Dict[str, Any]]:
+    """Crawl stage 3, batched: extract several pages with shared model requests.
+
+    The batch's LLM usage is split evenly across its pages' telemetry.
+    """
+    pages = [(job["url"], job.pop("markdown")) for job in jobs]
+    usage: Dict[str, Any] = {}
+    started = time.perf_counter()
+    results = extract_listings_batch(pages, ctx.fields, ctx.llm_cache, rule_based=ctx.rule_based, telemetry=usage)
+    elapsed = time.perf_counter() - started
+    for job in jobs:
+        job["data"] = results.get(job["url"], {"listings": []})
+        job["telemetry"]["extract_seconds"] = elapsed
+        job["telemetry"]["batch_size"] = len(jobs)
+        for key, value in usage.items():
+            add_telemetry(job["telemetry"], key, value / len(jobs))
+        record_extraction(job, ctx)
+    return jobs
+
+def save_step(job: Dict[str, Any], ctx: CrawlContext) -> Dict[str, Any]:
+    """Crawl stage 4: append the extracted listings to the run's output."""
+    listings = job["data"].get("listings", [])
+    if not listings:
+        logging.warning(f"No data to save for {job['url']}")
+    started = time.perf_counter()
+    ctx.sink.write(listings)
+    job["telemetry"]["save_seconds"] = time.perf_counter() - started
+    if ctx.metrics:
+        ctx.metrics.record(job["url"], "ok" if listings else "no_listings", job["telemetry"])
+    return job
+
+def polite_delay() -> None:
+    """Random delay between requests to avoid overloading servers."""
+    time.sleep(random.uniform(*POLITE_DELAY_SECONDS))
+
+def needs_delay(job: Dict[str, Any]) -> bool:
+    """Whether a job just made a request to the site (rather than being served locally)."""
+    return job.get("telemetry", {}).get("fetcher") in ("http", "selenium")
+
+def iter_jobs(urls: Iterable[str], ctx: CrawlContext, counts: Dict[str, int]) -> Iterator[Dict[str, Any]]:
+    """Turn URLs into crawl jobs as they are consumed, skipping ones the journal has finished."""
     for i, url in enumerate(urls):
+        counts["urls"] += 1
         url = url.strip()
         if not url:
             logging.warning(f"Skipping empty URL at index {i}")
             continue
+        job = {"index": i, "url": url}
+        if resume_job(job, ctx):
+            counts["resumed"] += 1
+        else:
+            yield job
 
-        logging.info(f"Processing URL {i+1}/{len(urls)}: {url}")
+def scrape_urls(
+    urls: Iterable[str],
+    fields: List[str],
+    pipelined: bool = False,
+    stage_workers: Dict[str, int] = None,
+    http_fast_path: bool = HTTP_FAST_PATH,
+    use_cache: bool = True,
+    journal_path: str = JOURNAL_PATH,
+    use_llm_cache: bool = True,
+    rule_based: bool = True,
+    batched: bool = False,
+    markdown_processes: int = MARKDOWN_PROCESSES,
+    metrics_textfile: str = METRICS_TEXTFILE,
+    recrawl: bool = False,
+) -> None:
+    """Scrape multiple URLs, extract fields, and save results.
 
-        # Fetch and process HTML
-        html = fetch_html_selenium(url)
-        if not html:
-            logging.warning(f"No HTML content retrieved for {url}")
-            continue
+    ``urls`` may be any iterable, such as ``get_urls.iter_urls``; it is
+    consumed lazily as the crawl makes progress.
 
-        markdown = html_to_markdown(html)
+    Listings are appended to ``data_<timestamp>_combined.jsonl`` and ``.csv``
+    (and ``.parquet`` with ``SINK_PARQUET``) in ``OUTPUT_FOLDER`` as soon as
+    each page is extracted. Per-URL metrics
+    go to ``metrics_<timestamp>.jsonl`` next to them, and at the end a
+    ``metrics_<timestamp>.json`` summary and the Prometheus textfile at
+    ``metrics_textfile`` (``None`` to skip it) are written.
 
-        # Save raw markdown for debugging
-        raw_path = os.path.join(OUTPUT_FOLDER, f"raw_{timestamp}_{i}.md")
-        try:
-            with open(raw_path, "w", encoding="utf-8") as f:
-                f.write(markdown)
-            logging.info(f"Saved raw markdown to {raw_path}")
-        except Exception as e:
-            logging.error(f"Error saving raw markdown to {raw_path}: {e}")
-
-        # Extract data using the improved extraction function
-        data = extract_data_from_model(markdown, fields, url)
-        save_data(data, timestamp, url)
-        all_data["listings"].extend(data.get("listings", []))
-
-        # Random delay between requests to avoid overloading servers
-        if i < len(urls) - 1:
-            delay = random.uniform(2, 5)
-            time.sleep(delay)
-
-    # Save combined data
-    if all_data["listings"]:
-        save_data(all_data, timestamp)
-        logging.info(f"All URLs processed successfully. Extracted {len(all_data['listings'])} listings.")
+    By default each URL is fetched, converted, extracted and saved before the
+    next one starts. With ``pipelined=True`` the four steps run as concurrent
+    stages connected by bounded queues, with ``stage_workers`` overriding the
+    per-stage thread counts in ``STAGE_WORKERS``. With ``http_fast_path``
+    pages are first requested without a browser (see ``fetch_html``). With
+    ``use_cache`` unchanged pages are served from the on-disk fetch cache.
+
+    Progress is recorded in the crawl journal at ``journal_path`` (``None``
+    disables it): URLs extracted in an earlier run are skipped and pages whose
+    markdown was saved resume at extraction. With ``use_llm_cache`` pages
+    whose content and prompt are unchanged reuse earlier extraction results.
+    With ``rule_based`` fields are parsed from the page sections first and
+    the model is only asked for what the parser could not resolve. With
+    ``batched`` up to ``LLM_BATCH_SIZE`` pages share one model request.
+    With ``markdown_processes`` the pipelined markdown stage converts pages
+    in chunks on that many worker processes.
+
+    With ``recrawl`` pages finished in earlier runs are fetched again,
+    bypassing the fetch cache's TTL, and only those whose normalized
+    markdown hash differs from the journal's (or that are new) are
+    extracted. Unchanged pages contribute their journaled listings, so this
+    run's output is a full snapshot of the crawled URLs. The delta is in the
+    ``recrawl_<timestamp>.json`` report, which lists the unchanged, changed,
+    added, removed and failed URLs. "Removed" means journaled URLs that are
+    not in this run, so recrawling a subset reports the rest as removed.
+    Needs the journal.
+    """
+    if not fields or (isinstance(urls, (list, tuple)) and not urls):
+        logging.error("URLs and fields must not be empty")
+        return
+    if recrawl and not journal_path:
+        logging.error("A recrawl compares pages against the crawl journal; journal_path must be set")
+        return
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    workers = dict(STAGE_WORKERS, **(stage_workers or {}))
+    with ExitStack() as resources:
+        ctx = CrawlContext(fields, timestamp, len(urls) if hasattr(urls, "__len__") else None, rule_based=rule_based)
+        ctx.sink = resources.enter_context(
+            ListingSink(os.path.join(OUTPUT_FOLDER, f"data_{timestamp}_combined"), fields + ["URL"],
+                        parquet=SINK_PARQUET)
+        )
+        ctx.metrics = resources.enter_context(
+            CrawlMetrics(os.path.join(OUTPUT_FOLDER, f"metrics_{timestamp}.jsonl"))
+        )
+        ctx.pool = resources.enter_context(DriverPool(
+            setup_selenium,
+            size=workers["fetch"] if pipelined else DRIVER_POOL_SIZE,
+            max_pages=DRIVER_MAX_PAGES,
+            max_memory_mb=DRIVER_MAX_MEMORY_MB,
+        ))
+        if http_fast_path:
+            ctx.http_fetcher = resources.enter_context(
+                AsyncHttpFetcher(USER_AGENTS, max_connections=HTTP_MAX_CONNECTIONS)
+            )
+        if use_cache:
+            ctx.cache = resources.enter_context(
+                FetchCache(FETCH_CACHE_FOLDER, ttl=FETCH_CACHE_TTL, max_bytes=FETCH_CACHE_MAX_MB * 1024 * 1024)
+            )
+        if journal_path:
+            os.makedirs(os.path.dirname(journal_path) or ".", exist_ok=True)
+            ctx.journal = resources.enter_context(CrawlJournal(journal_path))
+        if recrawl:
+            ctx.recrawl = RecrawlReport()
+        if use_llm_cache:
+            os.makedirs(CACHE_FOLDER, exist_ok=True)
+            ctx.llm_cache = resources.enter_context(
+                ExtractionCache(LLM_CACHE_PATH, max_bytes=LLM_CACHE_MAX_MB * 1024 * 1024)
+            )
+        resources.callback(LLM_CLIENT.close)
+        if pipelined and markdown_processes:
+            ctx.markdown_pool = resources.enter_context(MarkdownPool(markdown_processes, MARKDOWN_CHUNK_SIZE))
+
+        counts = {"urls": 0, "resumed": 0}
+        jobs = iter_jobs(urls, ctx, counts)
+
+        if pipelined:
+            def fetch_politely(job):
+                result = fetch_step(job, ctx)
+                if needs_delay(job):
+                    polite_delay()
+                return result
+
+            StagedPipeline(
+                [
+                    Stage("fetch", fetch_politely, workers["fetch"]),
+                    Stage("markdown", lambda job: markdown_step(job, ctx), workers["markdown"])
+                    if not ctx.markdown_pool else
+                    Stage("markdown", lambda jobs: markdown_batch_step(jobs, ctx), workers["markdown"],
+                          batch_size=MARKDOWN_CHUNK_SIZE),
+                    Stage("extract", lambda job: extract_step(job, ctx), workers["extract"])
+                    if not batched else
+                    Stage("extract", lambda jobs: extract_batch_step(jobs, ctx), workers["extract"],
+                          batch_size=LLM_BATCH_SIZE),
+                    Stage("save", lambda job: save_step(job, ctx), workers["save"]),
+                ],
+                queue_size=STAGE_QUEUE_SIZE,
+            ).run(jobs)
+        else:
+            ready = []
+            previous = None
+            for job in jobs:
+                if previous and needs_delay(previous):
+                    polite_delay()
+                previous = job
+                if fetch_step(job, ctx) and markdown_step(job, ctx):
+                    if not batched:
+                        save_step(extract_step(job, ctx), ctx)
+                    else:
+                        ready.append(job)
+                if len(ready) >= LLM_BATCH_SIZE:
+                    for done in extract_batch_step(ready, ctx):
+                        save_step(done, ctx)
+                    ready = []
+            if ready:
+                for done in extract_batch_step(ready, ctx):
+                    save_step(done, ctx)
+
+        if counts["resumed"]:
+            logging.info(f"{counts['resumed']} of {counts['urls']} URLs were already done in an earlier run")
+        if ctx.journal:
+            logging.info(f"Crawl journal: {json.dumps(ctx.journal.summary())}")
+        if ctx.recrawl:
+            report = ctx.recrawl.summary(ctx.journal.urls())
+            report_path = os.path.join(OUTPUT_FOLDER, f"recrawl_{timestamp}.json")
+            with open(report_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=4)
+            logging.info(f"Recrawl: {json.dumps(report['counts'])}; report written to {report_path}")
+        ctx.metrics.write(os.path.join(OUTPUT_FOLDER, f"metrics_{timestamp}.json"), metrics_textfile)
+
+    if ctx.sink.stats["listings"]:
+        logging.info(f"All URLs processed successfully. Extracted {ctx.sink.stats['listings']} listings.")
     else:
         logging.warning("No data extracted from any URL")
 
@@ -1090,4 +1903,11 @@ if __name__ == "__main__":
     fields = ["Scheme Name", "Ministries/Departments", "Target Beneficiaries", 
               "Eligibility Criteria", "Description & Benefits", "Application Process", "Tags"]
 
-    scrape_urls(urls, fields)
\ No newline at end of file
+    # A URL manifest from catalog.py (`--manifest [path]`, latest by default) or
+    # catalog dumps given on the command line (e.g. urls/all.json) replace the list above
+    if sys.argv[1:2] == ["--manifest"]:
+        urls = manifest_urls(sys.argv[2] if len(sys.argv) > 2 else None)
+    elif len(sys.argv) > 1:
+        urls = iter_urls(sys.argv[1:])
+
+    scrape_urls(urls, fields)
@@ -0,0 +1,38 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Optional
+
+
+class BackgroundLoop:
+    """An asyncio event loop running on a daemon thread.
+
+    Lets the threaded crawl code share async clients (and their connection
+    pools) by submitting coroutines from any thread with ``run``.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._serve, name="asyncio-loop", daemon=True)
+        self._thread.start()
+
+    def _serve(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the loop and block the calling thread until it finishes."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def close(self) -> None:
+        """Stop the loop and wait for its thread to exit."""
+        if self.loop.is_closed():
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+    def __enter__(self) -> "BackgroundLoop":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,68 @@
+"""Micro-benchmark: BeautifulSoup cleaning vs the lxml ``<main>`` fast path of html_to_markdown.
+
+Usage: python benchmarks/bench_html_to_markdown.py [pages_dir] [--pages N] [--repeat N]
+
+Without ``pages_dir`` synthetic pages are generated from final.json (see
+corpus.py). Both paths are checked to produce identical markdown.
+"""
+import os
+import re
+import sys
+import glob
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import generate_pages  # noqa: E402
+from app import clean_html, html_to_markdown, markdown_converter, remove_urls  # noqa: E402
+
+
+def soup_markdown(html_content: str) -> str:
+    """The previous conversion: BeautifulSoup clean, re-serialize, then html2text."""
+    markdown = markdown_converter().handle(clean_html(html_content))
+    markdown = re.sub(r"\n{3,}", "\n\n", markdown)
+    return remove_urls(markdown)
+
+
+def time_pages(convert, pages, repeat):
+    timings = []
+    for _ in range(repeat):
+        for page in pages:
+            started = time.perf_counter()
+            convert(page)
+            timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pages_dir", nargs="?", help="Directory of saved .html pages")
+    parser.add_argument("--pages", type=int, default=100, help="Synthetic pages to generate")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.pages_dir:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(args.pages_dir, "*.html"))):
+            with open(path, encoding="utf-8") as f:
+                pages.append(f.read())
+    else:
+        pages = [page for _, page in generate_pages(args.pages)]
+    print(f"{len(pages)} pages, {sum(map(len, pages)) / len(pages) / 1024:.0f} KiB on average")
+
+    mismatches = sum(1 for page in pages if soup_markdown(page) != html_to_markdown(page))
+    print(f"Identical output: {len(pages) - mismatches}/{len(pages)} pages")
+
+    results = {}
+    for name, convert in (("beautifulsoup", soup_markdown), ("lxml fast path", html_to_markdown)):
+        timings = time_pages(convert, pages, args.repeat)
+        results[name] = statistics.mean(timings)
+        print(f"{name:>15}: mean {results[name] * 1000:.2f} ms/page, "
+              f"p95 {sorted(timings)[int(len(timings) * 0.95)] * 1000:.2f} ms/page")
+    print(f"Speedup: {results['beautifulsoup'] / results['lxml fast path']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
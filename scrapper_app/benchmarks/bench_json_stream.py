@@ -0,0 +1,89 @@
+"""Check that json_stream.iter_array stays in one pass with a bounded buffer.
+
+Listings from final.json are written as a bare array and as a
+``{"listings": [...]}`` object. Both are streamed back and compared with
+``json.load``. The peak size of the reader's text buffer is recorded, along
+with the wall time. The script exits non-zero if the keyed object needs a
+buffer much larger than the bare array, or if any chunk size decodes the
+records differently.
+
+Usage: python benchmarks/bench_json_stream.py [--records N] [--chunk-size BYTES]
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json_stream  # noqa: E402
+from corpus import load_listings  # noqa: E402
+
+
+def stream(path, chunk_size, key=None):
+    """Records from ``path`` with the peak buffer length (in characters) and the seconds taken."""
+    peak = 0
+    more = json_stream._Reader.more
+
+    def tracked(reader, read_size=None):
+        nonlocal peak
+        grew = more(reader, read_size)
+        peak = max(peak, len(reader.buffer))
+        return grew
+
+    json_stream._Reader.more = tracked
+    try:
+        started = time.perf_counter()
+        with open(path, "rb") as f:
+            records = list(json_stream.iter_array(f, chunk_size, key=key))
+        return records, peak, time.perf_counter() - started
+    finally:
+        json_stream._Reader.more = more
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000, help="Records to write (cycling final.json)")
+    parser.add_argument("--chunk-size", type=int, default=64 * 1024)
+    args = parser.parse_args()
+
+    listings = load_listings()
+    records = [dict(listings[i % len(listings)], row=i, score=i / 7) for i in range(args.records)]
+    workdir = tempfile.mkdtemp(prefix="json-stream-bench-")
+    bare_path = os.path.join(workdir, "bare.json")
+    keyed_path = os.path.join(workdir, "keyed.json")
+    with open(bare_path, "w", encoding="utf-8") as f:
+        json.dump(records, f)
+    with open(keyed_path, "w", encoding="utf-8") as f:
+        json.dump({"total": len(records), "meta": {"source": "final.json"}, "listings": records, "done": True}, f)
+
+    failures = []
+    peaks = {}
+    for name, path, key in (("bare array", bare_path, None), ("keyed object", keyed_path, "listings")):
+        streamed, peak, seconds = stream(path, args.chunk_size, key)
+        peaks[name] = peak
+        size = os.path.getsize(path)
+        print(f"{name:<14}{size / 2**20:>8.1f} MiB{seconds:>8.2f}s  peak buffer {peak / 1024:>8.0f} KiB chars")
+        if streamed != records:
+            failures.append(f"{name}: streamed records differ from json.load")
+    if peaks["keyed object"] > 2 * peaks["bare array"] + args.chunk_size:
+        failures.append(f"keyed object buffered {peaks['keyed object']} chars against {peaks['bare array']}")
+
+    # Numbers and literals cut by every possible chunk boundary
+    sample = json.dumps({"listings": [{"n": 4.5e-7, "i": 12345, "ok": True, "s": "a"}, -0.25, [1, 2], None]})
+    expected = json.loads(sample)["listings"]
+    for chunk_size in range(1, len(sample) + 1):
+        if list(json_stream.iter_array(io.BytesIO(sample.encode()), chunk_size, key="listings")) != expected:
+            failures.append(f"chunk size {chunk_size}: wrong values")
+            break
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Offline end-to-end benchmark of scrape_urls.
+
+Scheme pages are served by a local FixtureServer and extraction requests go
+to a local MockLlmServer, so nothing touches myscheme.gov.in or Groq. Reports
+pages per minute and p50/p95 latency of each crawl step. With the selenium
+fetcher it also reports what Chrome downloaded; compare a run with
+``--no-blocking`` to see what resource blocking saves.
+
+Usage: python benchmarks/bench_scraper.py [--pages N] [--pages-dir DIR] [--fetcher http|selenium]
+       [--no-blocking] [--pipelined] [--batched] [--rule-based] [--latency S] [--rpm N] [--tpm N]
+       [--json PATH]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import statistics
+from functools import wraps
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from corpus import write_pages  # noqa: E402
+from fixture_server import FixtureServer  # noqa: E402
+from mock_llm_server import MockLlmServer  # noqa: E402
+
+# Crawl steps timed, as (attribute of the app module, name in the report)
+TIMED_STEPS = [
+    ("fetch_html", "fetch_html"),
+    ("fetch_html_selenium", "fetch_html_selenium"),
+    ("html_to_markdown", "html_to_markdown"),
+    ("extract_data_from_model", "extract_data_from_model"),
+    ("extract_batch_from_model", "extract_batch_from_model"),
+    ("save_step", "save (ListingSink)"),
+]
+
+
+class StepTimer:
+    """Collects the wall time of every call to the wrapped functions."""
+
+    def __init__(self):
+        self.timings = {}
+        self._lock = threading.Lock()
+
+    def wrap(self, name, func):
+        @wraps(func)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.timings.setdefault(name, []).append(time.perf_counter() - started)
+        return timed
+
+    def summary(self):
+        report = {}
+        for name, values in self.timings.items():
+            ordered = sorted(values)
+            report[name] = {
+                "calls": len(ordered),
+                "mean_ms": statistics.mean(ordered) * 1000,
+                "p50_ms": ordered[len(ordered) // 2] * 1000,
+                "p95_ms": ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)] * 1000,
+            }
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=50, help="Synthetic pages to generate")
+    parser.add_argument("--pages-dir", help="Serve saved <slug>.html pages from here instead")
+    parser.add_argument("--fetcher", choices=["http", "selenium"], default="http",
+                        help="http: browserless fast path; selenium: render every page in Chrome")
+    parser.add_argument("--no-blocking", action="store_true",
+                        help="Let Chrome load every subresource (network use is still measured)")
+    parser.add_argument("--pipelined", action="store_true")
+    parser.add_argument("--batched", action="store_true", help="Batch several pages per LLM request")
+    parser.add_argument("--rule-based", action="store_true", help="Parse sections before calling the model")
+    parser.add_argument("--latency", type=float, default=0.5, help="Mock LLM seconds per response")
+    parser.add_argument("--rpm", type=int, help="Mock LLM requests per minute before 429s")
+    parser.add_argument("--tpm", type=int, help="Mock LLM tokens per minute before 429s")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="scraper-bench-")
+    pages_dir = args.pages_dir or os.path.join(workdir, "pages")
+    if args.pages_dir:
+        slugs = sorted(os.path.splitext(name)[0] for name in os.listdir(pages_dir) if name.endswith(".html"))
+    else:
+        slugs = write_pages(pages_dir, args.pages)
+    json_path = os.path.abspath(args.json) if args.json else None
+
+    with FixtureServer(pages_dir) as site, MockLlmServer(latency=args.latency, rpm=args.rpm, tpm=args.tpm) as llm:
+        # The app reads these when imported; its output and logs go to the work directory
+        os.environ["LLM_BASE_URL"] = llm.base_url
+        os.environ.setdefault("GROQ_API_KEY", "mock")
+        os.chdir(workdir)
+        import app
+        from llm_scheduler import LlmRateScheduler
+        from resource_blocking import ResourceBlocker
+
+        app.POLITE_DELAY_SECONDS = (0, 0)
+        app.LLM_SCHEDULER = LlmRateScheduler(
+            args.rpm or 10**6, 10**8, args.tpm or 10**9, 10**10, max_wait=app.LLM_MAX_RATE_WAIT
+        )
+        if args.no_blocking:
+            app.RESOURCE_BLOCKER = ResourceBlocker(app.FIRST_PARTY_HOSTS, blocked_types=[], blocked_hosts=[],
+                                                   learn_hosts=False)
+        timer = StepTimer()
+        for attribute, name in TIMED_STEPS:
+            setattr(app, attribute, timer.wrap(name, getattr(app, attribute)))
+
+        urls = [site.url_for(slug) for slug in slugs]
+        started = time.perf_counter()
+        app.scrape_urls(
+            urls,
+            app.SCHEME_FIELDS,
+            pipelined=args.pipelined,
+            http_fast_path=args.fetcher == "http",
+            use_cache=False,
+            journal_path=None,
+            use_llm_cache=False,
+            rule_based=args.rule_based,
+            batched=args.batched,
+        )
+        elapsed = time.perf_counter() - started
+        saved = timer.timings.get("save (ListingSink)", [])
+
+        report = {
+            "pages": len(urls),
+            "seconds": elapsed,
+            "pages_per_minute": len(saved) / elapsed * 60 if elapsed else 0.0,
+            "settings": {k: v for k, v in vars(args).items() if k != "json"},
+            "steps": timer.summary(),
+            "llm": {"requests": llm.requests, "rate_limited": llm.rate_limited, "max_in_flight": llm.max_in_flight},
+            "output": workdir,
+        }
+        network = app.RESOURCE_BLOCKER.stats if app.RESOURCE_BLOCKER else {}
+        if network.get("pages"):
+            report["network"] = dict(network, bytes_per_page=network["bytes"] / network["pages"])
+
+    print(f"\n{report['pages']} pages in {elapsed:.1f}s: {report['pages_per_minute']:.1f} pages/min")
+    print(f"{'step':<26}{'calls':>7}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, stats in report["steps"].items():
+        print(f"{name:<26}{stats['calls']:>7}{stats['mean_ms']:>10.1f}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}")
+    if "network" in report:
+        network = report["network"]
+        print(f"Chrome: {network['bytes_per_page'] / 1024:.0f} KiB per page, {network['requests']} requests, "
+              f"{network['blocked']} blocked, {network['learned_hosts']} hosts learned")
+    print(f"LLM: {report['llm']['requests']} requests, {report['llm']['rate_limited']} rate limited, "
+          f"at most {report['llm']['max_in_flight']} in flight")
+    print(f"Output and logs in {workdir}")
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Synthetic myscheme.gov.in pages built from the listings in final.json.
+
+The pages mimic the live site's structure: a head with a large inline
+``__NEXT_DATA__`` script, site navigation, a ``<main>`` holding the scheme
+title, tags and sections, and a footer. Like the live site they pull in a
+stylesheet, a web font and a banner image, which ``write_pages`` writes
+under ``assets/`` so Chrome has subresources to download (or block).
+"""
+import os
+import re
+import json
+import html
+import random
+from typing import Any, Dict, Iterator, List, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+LISTINGS_PATH = os.path.join(os.path.dirname(HERE), "final.json")
+
+_NUMBERED = re.compile(r"\s*(?=\b\d{1,2}\.\s)")
+_NUMBER = re.compile(r"^\d{1,2}\.\s+")
+
+# Subresources every page references, as (path under the pages dir, size in bytes)
+ASSETS = [
+    ("assets/site.css", 60_000),
+    ("assets/fonts/noto-sans.woff2", 90_000),
+    ("assets/img/banner.png", 150_000),
+]
+
+
+def load_listings(path: str = LISTINGS_PATH) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["listings"]
+
+
+def slug_for(listing: Dict[str, Any], index: int) -> str:
+    url = listing.get("URL") or ""
+    slug = url.rstrip("/").rsplit("/", 1)[-1]
+    return slug or f"scheme-{index}"
+
+
+def _paragraphs(text: str) -> str:
+    """Render numbered criteria as an ordered list and other text as paragraphs."""
+    text = text or "Not specified."
+    items = [item.strip() for item in _NUMBERED.split(text) if item.strip()]
+    if len(items) > 1 and all(_NUMBER.match(item) for item in items):
+        lis = "".join(f"<li><p>{html.escape(_NUMBER.sub('', item))}</p></li>" for item in items)
+        return f"<ol>{lis}</ol>"
+    return "".join(f"<p>{html.escape(sentence)}&nbsp;</p>" for sentence in text.split(". ") if sentence)
+
+
+def render_page(listing: Dict[str, Any], index: int, seed: int = 0) -> str:
+    """One scheme page in the layout of the live site."""
+    rng = random.Random(seed * 100003 + index)
+    name = html.escape(listing.get("Scheme Name") or f"Scheme {index}")
+    ministry = html.escape(listing.get("Ministries/Departments") or "Government of India")
+    tags = [t.strip() for t in str(listing.get("Tags") or "").split(",") if t.strip()]
+    next_data = json.dumps({"props": {"pageProps": {"scheme": listing, "related": [
+        {"slug": f"related-{rng.randrange(10**6)}", "blurb": "x" * rng.randrange(200, 800)} for _ in range(60)
+    ]}}})
+    nav = "".join(f'<li><a href="/category/{n}">Category {n}</a></li>' for n in range(40))
+    side = "".join(f'<a href="#{s.lower()}">{s}</a>' for s in
+                   ("Details", "Benefits", "Eligibility", "Application Process", "Documents Required"))
+    documents = "".join(f"<li>{html.escape(d)}</li>" for d in
+                        ("Aadhaar Card", "Proof of Residence", "Income Certificate", "Bank Account Details"))
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8"><title>{name} | myScheme</title>
+<link rel="stylesheet" href="/assets/site.css">
+<link rel="preload" href="/assets/fonts/noto-sans.woff2" as="font" type="font/woff2" crossorigin>
+<style>body {{ font-family: sans-serif; }} .tag {{ padding: 2px; }}</style>
+<script id="__NEXT_DATA__" type="application/json">{html.escape(next_data, quote=False)}</script>
+<script src="/_next/static/chunks/main.js" defer></script>
+</head>
+<body>
+<header><nav><ul>{nav}</ul></nav><a href="/login">Sign In</a></header>
+<div id="__next">
+<img class="banner" src="/assets/img/banner.png?scheme={index}" alt="">
+<main class="scheme-page">
+<div class="breadcrumb"><a href="/">Home</a> &gt; <a href="/search">Schemes</a> &gt; {name}</div>
+<p class="ministry">{ministry}</p>
+<h1>{name}</h1>
+<div class="tags">{"".join(f'<span class="tag">{html.escape(tag)}</span><br>' for tag in tags)}</div>
+<aside>{side}</aside>
+<section id="details"><h3>Details</h3>{_paragraphs(listing.get("Description & Benefits"))}
+<p>Target beneficiaries: <strong>{html.escape(listing.get("Target Beneficiaries") or "All")}</strong></p></section>
+<section id="benefits"><h3>Benefits</h3>
+<table><tr><th>Benefit</th><th>Amount</th></tr><tr><td>Assistance</td><td>&#8377;{rng.randrange(1000, 50000)}</td></tr></table>
+</section>
+<section id="eligibility"><h3>Eligibility</h3>{_paragraphs(listing.get("Eligibility Criteria"))}</section>
+<section id="application-process"><h3>Application Process</h3><h4>Offline</h4>{_paragraphs(listing.get("Application Process"))}
+<p>Visit the <a href="https://example.gov.in/apply?id={index}&amp;lang=en">official portal</a> &amp; apply.</p></section>
+<section id="documents"><h3>Documents Required</h3><ul>{documents}</ul></section>
+<!-- feedback widget -->
+<section><h3>Frequently Asked Questions</h3><p>Who can apply? <em>See eligibility</em> &lsquo;above&rsquo;.</p></section>
+</main>
+</div>
+<footer><p>&copy; Government of India</p><ul>{nav}</ul></footer>
+<script>window.__analytics = {{ id: "{rng.randrange(10**9)}" }};</script>
+</body>
+</html>"""
+
+
+def generate_pages(count: int = None, seed: int = 0) -> Iterator[Tuple[str, str]]:
+    """Yield ``(slug, html)`` for ``count`` pages (every listing once if ``None``), cycling as needed."""
+    listings = load_listings()
+    total = len(listings) if count is None else count
+    for index in range(total):
+        listing = listings[index % len(listings)]
+        suffix = "" if index < len(listings) else f"-{index // len(listings)}"
+        yield slug_for(listing, index) + suffix, render_page(listing, index, seed)
+
+
+def write_pages(root: str, count: int = None, seed: int = 0) -> List[str]:
+    """Write generated pages as ``<root>/<slug>.html`` (the FixtureServer layout) and their assets; returns the slugs."""
+    os.makedirs(root, exist_ok=True)
+    rng = random.Random(seed)
+    for path, size in ASSETS:
+        target = os.path.join(root, *path.split("/"))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as f:
+            f.write(bytes(rng.getrandbits(8) for _ in range(size)))
+    slugs = []
+    for slug, page in generate_pages(count, seed):
+        with open(os.path.join(root, f"{slug}.html"), "w", encoding="utf-8") as f:
+            f.write(page)
+        slugs.append(slug)
+    return slugs
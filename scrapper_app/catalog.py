@@ -0,0 +1,241 @@
+import os
+import re
+import sys
+import glob
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+import aiohttp
+
+from llm_scheduler import TokenBucket, parse_duration
+
+# myscheme.gov.in search API behind the scheme listing; it pages with from/size
+CATALOG_API_URL = os.getenv("CATALOG_API_URL", "https://api.myscheme.gov.in/search/v4/schemes")
+CATALOG_PAGE_SIZE = 10
+CATALOG_MAX_CONCURRENCY = 4
+CATALOG_REQUESTS_PER_SECOND = 4
+CATALOG_RETRIES = 4
+MANIFEST_FOLDER = os.path.join("urls", "manifests")
+SCHEME_BASE_URL = "https://www.myscheme.gov.in/schemes/"
+
+_MANIFEST_NAME = re.compile(r"manifest_v(\d+)\.json$")
+
+
+class CatalogError(Exception):
+    """Raised when a catalog page could not be fetched after all retries."""
+
+
+class CatalogEnumerator:
+    """Walk every page of the scheme search API concurrently.
+
+    The first page gives ``totalPages``; the rest are requested by up to
+    ``max_concurrency`` coroutines, started no faster than
+    ``requests_per_second``. Failed pages (network errors, 429 and 5xx) are
+    retried ``retries`` times with jittered exponential backoff, honouring
+    ``Retry-After``. Results are sorted by scheme name so that the page
+    boundaries stay stable while the catalog is walked.
+    """
+
+    def __init__(
+        self,
+        api_url: str = CATALOG_API_URL,
+        page_size: int = CATALOG_PAGE_SIZE,
+        max_concurrency: int = CATALOG_MAX_CONCURRENCY,
+        requests_per_second: float = CATALOG_REQUESTS_PER_SECOND,
+        retries: int = CATALOG_RETRIES,
+        api_key: str = None,
+        timeout: float = 20,
+    ):
+        self.api_url = api_url
+        self.page_size = page_size
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.api_key = api_key if api_key is not None else os.getenv("CATALOG_API_KEY")
+        self.timeout = timeout
+        # A one-request bucket: evenly spaced starts, no initial burst
+        self._bucket = TokenBucket(1, 1 / requests_per_second)
+        self._rate_lock = asyncio.Lock()
+        self.stats = {"pages": 0, "requests": 0, "retries": 0, "rate_limited": 0, "total": None}
+
+    async def _rate_cap(self) -> None:
+        async with self._rate_lock:
+            while True:
+                now = time.monotonic()
+                self._bucket.refill(now)
+                wait = self._bucket.wait_time(1)
+                if not wait:
+                    self._bucket.tokens -= 1
+                    return
+                await asyncio.sleep(wait)
+
+    async def fetch_page(self, session: aiohttp.ClientSession, page: int) -> Dict[str, Any]:
+        """Fetch one page of results; raises ``CatalogError`` once retries are used up."""
+        params = {
+            "lang": "en",
+            "q": "[]",
+            "keyword": "",
+            "sort": "schemename-asc",
+            "from": page * self.page_size,
+            "size": self.page_size,
+        }
+        headers = {"Accept": "application/json"}
+        if self.api_key:
+            headers["x-api-key"] = self.api_key
+        for attempt in range(self.retries + 1):
+            await self._rate_cap()
+            self.stats["requests"] += 1
+            retry_after = None
+            try:
+                async with session.get(self.api_url, params=params, headers=headers) as response:
+                    if response.status == 200:
+                        body = await response.json(content_type=None)
+                        self.stats["pages"] += 1
+                        return body
+                    if response.status == 429:
+                        self.stats["rate_limited"] += 1
+                    elif response.status < 500:
+                        raise CatalogError(f"Catalog page {page}: HTTP {response.status}")
+                    retry_after = parse_duration(response.headers.get("Retry-After"))
+                    error = f"HTTP {response.status}"
+            except (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError) as e:
+                error = repr(e)
+            if attempt == self.retries:
+                raise CatalogError(f"Catalog page {page} failed after {attempt + 1} attempts: {error}")
+            self.stats["retries"] += 1
+            delay = retry_after if retry_after is not None else 2 ** attempt + random.uniform(0, 1)
+            logging.warning(f"Catalog page {page}: {error}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def enumerate(self) -> List[Dict[str, Any]]:
+        """Fetch all pages; returns the catalog items in page order."""
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        ) as session:
+            first = await self.fetch_page(session, 0)
+            hits = first["data"]["hits"]
+            total_pages = hits["page"]["totalPages"]
+            self.stats["total"] = hits["page"]["total"]
+            logging.info(f"Catalog: {self.stats['total']} schemes on {total_pages} pages")
+
+            pages = {0: hits["items"]}
+            queue = asyncio.Queue()
+            for page in range(1, total_pages):
+                queue.put_nowait(page)
+
+            async def worker():
+                while not queue.empty():
+                    page = queue.get_nowait()
+                    body = await self.fetch_page(session, page)
+                    pages[page] = body["data"]["hits"]["items"]
+
+            workers = [asyncio.ensure_future(worker()) for _ in range(self.max_concurrency)]
+            try:
+                await asyncio.gather(*workers)
+            except BaseException:
+                for task in workers:
+                    task.cancel()
+                raise
+        return [item for page in sorted(pages) for item in pages[page]]
+
+
+def dedupe_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One manifest entry per slug, in first-seen order."""
+    entries = {}
+    for item in items:
+        fields = item.get("fields", {})
+        slug = fields.get("slug")
+        if slug and slug not in entries:
+            entries[slug] = {"slug": slug, "name": fields.get("schemeName"), "url": SCHEME_BASE_URL + slug}
+    return list(entries.values())
+
+
+def latest_manifest(folder: str = MANIFEST_FOLDER) -> Optional[str]:
+    """Path of the highest-numbered manifest in ``folder``, if any."""
+    versions = []
+    for path in glob.glob(os.path.join(folder, "manifest_v*.json")):
+        match = _MANIFEST_NAME.search(path)
+        if match:
+            versions.append((int(match.group(1)), path))
+    return max(versions)[1] if versions else None
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def manifest_urls(path: str = None) -> Iterator[str]:
+    """Yield the URLs of a manifest (the latest one by default) for ``scrape_urls``."""
+    path = path or latest_manifest()
+    if not path:
+        raise FileNotFoundError(f"No URL manifest in {MANIFEST_FOLDER}")
+    for entry in load_manifest(path)["entries"]:
+        yield entry["url"]
+
+
+def write_manifest(entries: List[Dict[str, Any]], api_total: int = None, folder: str = MANIFEST_FOLDER) -> str:
+    """Write ``entries`` as the next manifest version, recording what changed since the last one."""
+    os.makedirs(folder, exist_ok=True)
+    previous_path = latest_manifest(folder)
+    previous = load_manifest(previous_path) if previous_path else {"version": 0, "entries": []}
+    old = {entry["slug"] for entry in previous["entries"]}
+    new = {entry["slug"] for entry in entries}
+    manifest = {
+        "version": previous["version"] + 1,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "previous": os.path.basename(previous_path) if previous_path else None,
+        "api_total": api_total,
+        "count": len(entries),
+        "added": sorted(new - old),
+        "removed": sorted(old - new),
+        "entries": entries,
+    }
+    path = os.path.join(folder, f"manifest_v{manifest['version']:04d}.json")
+    partial = f"{path}.tmp"
+    with open(partial, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=4, ensure_ascii=False)
+    os.replace(partial, path)
+    logging.info(
+        f"Manifest v{manifest['version']}: {manifest['count']} URLs, "
+        f"{len(manifest['added'])} new, {len(manifest['removed'])} removed; written to {path}"
+    )
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Enumerate every scheme from the search API into a URL manifest.")
+    parser.add_argument("--api-url", default=CATALOG_API_URL)
+    parser.add_argument("--out", default=MANIFEST_FOLDER, help="Manifest folder")
+    parser.add_argument("--page-size", type=int, default=CATALOG_PAGE_SIZE)
+    parser.add_argument("--concurrency", type=int, default=CATALOG_MAX_CONCURRENCY)
+    parser.add_argument("--rps", type=float, default=CATALOG_REQUESTS_PER_SECOND, help="Requests per second cap")
+    parser.add_argument("--retries", type=int, default=CATALOG_RETRIES)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    enumerator = CatalogEnumerator(args.api_url, args.page_size, args.concurrency, args.rps, args.retries)
+    started = time.perf_counter()
+    try:
+        items = asyncio.run(enumerator.enumerate())
+    except CatalogError as e:
+        sys.exit(str(e))
+    entries = dedupe_items(items)
+    if enumerator.stats["total"] and len(entries) < enumerator.stats["total"]:
+        logging.warning(f"API reports {enumerator.stats['total']} schemes but only {len(entries)} unique slugs came back")
+    path = write_manifest(entries, enumerator.stats["total"], args.out)
+    manifest = load_manifest(path)
+    print(f"{len(entries)} URLs in {time.perf_counter() - started:.1f}s "
+          f"({enumerator.stats['requests']} requests, {enumerator.stats['retries']} retries)")
+    if manifest["previous"]:
+        print(f"Changes since {manifest['previous']}:")
+        for slug in manifest["added"]:
+            print(f"+ {slug}")
+        for slug in manifest["removed"]:
+            print(f"- {slug}")
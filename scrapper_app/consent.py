@@ -0,0 +1,100 @@
+import os
+import json
+import threading
+import logging
+from typing import Any, Dict, List, Optional
+
+from selenium import webdriver
+
+CONSENT_PATTERNS = ["accept", "agree", "allow", "consent", "continue", "ok", "got it"]
+
+# Same search order as the old per-pattern XPath loop (pattern, then tag, then
+# document order), but done in a single WebDriver round trip.
+CONSENT_SCRIPT = """
+const patterns = arguments[0];
+const visible = (el) => el.getClientRects().length > 0 && getComputedStyle(el).visibility !== "hidden";
+for (const pattern of patterns) {
+    for (const tag of ["button", "a", "div"]) {
+        for (const el of document.getElementsByTagName(tag)) {
+            if (!(el.textContent || "").toLowerCase().includes(pattern)) continue;
+            if (!visible(el) || el.disabled) continue;
+            el.click();
+            return pattern;
+        }
+    }
+}
+return null;
+"""
+
+
+def click_consent_button(driver: webdriver.Chrome, patterns: List[str] = CONSENT_PATTERNS) -> Optional[str]:
+    """Click the first visible consent control in one script call; returns the matched pattern."""
+    return driver.execute_script(CONSENT_SCRIPT, patterns)
+
+
+class ConsentJar:
+    """Cookie jar that remembers consent across browsers and crawl runs.
+
+    After the first consent click the browser's cookies are saved to ``path``
+    and injected (over the DevTools protocol, before any navigation) into
+    every other pooled browser, so the banner is only handled once.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._cookies: List[Dict[str, Any]] = []
+        self._version = 0
+        self._applied: Dict[str, int] = {}
+        self.handled = False
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._cookies = json.load(f)
+            self._version = 1
+            self.handled = True
+            logging.info(f"Loaded {len(self._cookies)} consent cookies from {self.path}")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable consent cookie jar {self.path}: {e}")
+
+    def sync(self, driver: webdriver.Chrome) -> None:
+        """Inject the saved cookies into ``driver`` unless it already has the latest set."""
+        with self._lock:
+            if not self._cookies or self._applied.get(driver.session_id) == self._version:
+                return
+            cookies, version = self._cookies, self._version
+        try:
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+            with self._lock:
+                self._applied[driver.session_id] = version
+        except Exception as e:
+            logging.warning(f"Could not restore consent cookies: {e}")
+
+    def mark_handled(self, driver: webdriver.Chrome) -> None:
+        """Record that a consent button was clicked in ``driver`` and persist its cookies.
+
+        Call only after an actual click: until then every page checks for a banner.
+        """
+        cookies = None
+        try:
+            cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+        except Exception as e:
+            logging.warning(f"Could not read consent cookies: {e}")
+        with self._lock:
+            self.handled = True
+            if cookies is None:
+                return
+            self._cookies = cookies
+            self._version += 1
+            self._applied[driver.session_id] = self._version
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(cookies, f)
+            logging.info(f"Saved {len(cookies)} consent cookies to {self.path}")
+        except OSError as e:
+            logging.warning(f"Could not save consent cookies to {self.path}: {e}")
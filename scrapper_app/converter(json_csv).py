@@ -1,36 +1,107 @@
-import json
+import os
 import csv
-import sys
+import json
+import argparse
+from itertools import chain, islice
 
-def json_to_csv(json_file, csv_file):
-    try:
-        # Read JSON data
+from json_stream import iter_array
+from listing_parquet import ParquetListingWriter
+
+# Records read to infer the columns when none are declared
+INFER_RECORDS = 100
+
+
+def iter_records(json_file):
+    """Stream records from JSONL, a JSON array, or an object with a ``listings`` array."""
+    if json_file.endswith((".jsonl", ".ndjson")):
         with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Check if data has the expected structure
-        if 'listings' in data and isinstance(data['listings'], list):
-            # Get all unique fieldnames from the listings
-            fieldnames = set()
-            for item in data['listings']:
-                fieldnames.update(item.keys())
-            
-            # Write to CSV
-            with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        raise ValueError(f"{json_file}:{line_number}: {e}") from None
+        return
+    with open(json_file, 'rb') as f:
+        first = f.read(1024).lstrip(b'\xef\xbb\xbf').lstrip()
+        f.seek(0)
+        key = 'listings' if first.startswith(b'{') else None
+        yield from iter_array(f, key=key)
+
+
+def infer_columns(records):
+    """Field names in first-seen order, so the column order is the same on every run."""
+    columns = {}
+    for record in records:
+        columns.update(dict.fromkeys(record))
+    return list(columns)
+
+
+def cell(value):
+    return json.dumps(value, ensure_ascii=False) if isinstance(value, (list, dict)) else value
+
+
+def json_to_csv(json_file, csv_file, columns=None, infer=INFER_RECORDS, parquet_file=None):
+    """Convert crawl output to CSV in a single streaming pass.
+
+    With ``columns`` the CSV has exactly those columns; otherwise they are
+    inferred from the first ``infer`` records. Fields outside the schema are
+    dropped and reported. List and dict values are written as JSON text, as
+    in the crawler's own CSV output. With ``parquet_file`` the same rows
+    also go to a Parquet file (with a ``slug`` key if there is a URL column).
+    """
+    try:
+        records = iter_records(json_file)
+        if not columns:
+            head = list(islice(records, infer))
+            columns = infer_columns(head)
+            records = chain(head, records)
+
+        count = 0
+        extra = {}
+        partial = f"{csv_file}.tmp"
+        parquet_partial = f"{parquet_file}.tmp" if parquet_file else None
+        try:
+            with open(partial, 'w', newline='', encoding='utf-8') as f:
+                parquet = ParquetListingWriter(parquet_partial, columns) if parquet_file else None
+                writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
                 writer.writeheader()
-                writer.writerows(data['listings'])
-            
-            print(f"Successfully converted {json_file} to {csv_file}")
-            print(f"Found {len(data['listings'])} records with {len(fieldnames)} columns")
-        else:
-            print("JSON structure not supported. Expected object with 'listings' array.")
-    
-    except Exception as e:
+                known = set(columns)
+                for record in records:
+                    if not isinstance(record, dict):
+                        raise ValueError(f"Record {count + 1} is not an object")
+                    for key in record.keys() - known:
+                        extra[key] = extra.get(key, 0) + 1
+                    writer.writerow({key: cell(value) for key, value in record.items()})
+                    if parquet:
+                        parquet.write([record])
+                    count += 1
+                if parquet:
+                    parquet.close()
+            os.replace(partial, csv_file)
+            if parquet_file:
+                os.replace(parquet_partial, parquet_file)
+        finally:
+            for leftover in (partial, parquet_partial):
+                if leftover and os.path.exists(leftover):
+                    os.remove(leftover)
+
+        print(f"Successfully converted {json_file} to {csv_file}" + (f" and {parquet_file}" if parquet_file else ""))
+        print(f"Found {count} records with {len(columns)} columns")
+        for key, times in sorted(extra.items()):
+            print(f"Dropped field {key!r} outside the schema ({times} records)")
+    except (OSError, ValueError) as e:
         print(f"Error: {str(e)}")
 
+
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python json_to_csv.py <input.json> <output.csv>")
-    else:
-        json_to_csv(sys.argv[1], sys.argv[2])
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Convert crawl output (JSON or JSONL listings) to CSV.")
+    parser.add_argument("input", help="JSONL, a JSON array, or an object with a 'listings' array")
+    parser.add_argument("output", help="CSV file to write")
+    parser.add_argument("--columns", help="Comma-separated columns, in order (default: inferred)")
+    parser.add_argument("--infer", type=int, default=INFER_RECORDS, help="Records used to infer the columns")
+    parser.add_argument("--parquet", help="Also write the rows to this Parquet file")
+    args = parser.parse_args()
+
+    columns = [column.strip() for column in args.columns.split(",")] if args.columns else None
+    json_to_csv(args.input, args.output, columns, args.infer, args.parquet)
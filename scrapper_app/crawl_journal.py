@@ -0,0 +1,197 @@
+import sys
+import json
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+STAGES = ("fetch", "markdown", "extract")
+
+
+class CrawlJournal:
+    """Durable per-URL record of how far each page got through the crawl.
+
+    Every stage (fetch, markdown, extract) is recorded as ``done`` or
+    ``failed`` together with its output (the markdown and the extracted
+    listings), so a rerun can skip finished pages and retry only the stages
+    that failed. The hash of the page's normalized markdown is kept too, so
+    a recrawl can tell which pages changed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                fetch_state TEXT,
+                markdown_state TEXT,
+                extract_state TEXT,
+                markdown TEXT,
+                listings TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL,
+                content_hash TEXT,
+                changed_at REAL
+            )"""
+        )
+        # Journals written before content hashes were kept lack the last two columns
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(pages)")}
+        for column, kind in (("content_hash", "TEXT"), ("changed_at", "REAL")):
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE pages ADD COLUMN {column} {kind}")
+        self._db.commit()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the journal row for ``url`` (listings decoded), or ``None``."""
+        with self._lock:
+            cursor = self._db.execute("SELECT * FROM pages WHERE url = ?", (url,))
+            row = cursor.fetchone()
+            columns = [c[0] for c in cursor.description]
+        if row is None:
+            return None
+        entry = dict(zip(columns, row))
+        entry["listings"] = json.loads(entry["listings"]) if entry["listings"] else []
+        return entry
+
+    def record(self, url: str, stage: str, state: str, error: str = None,
+               markdown: str = None, listings: List[Dict[str, Any]] = None, content_hash: str = None) -> None:
+        """Record the outcome of one stage for ``url``.
+
+        A ``content_hash`` that differs from the stored one updates
+        ``changed_at`` and clears the extract state.
+        """
+        if stage not in STAGES:
+            raise ValueError(f"Unknown crawl stage: {stage}")
+        with self._lock:
+            self._db.execute(
+                "INSERT OR IGNORE INTO pages (url, updated_at) VALUES (?, ?)", (url, time.time())
+            )
+            self._db.execute(
+                f"UPDATE pages SET {stage}_state = ?, error = ?, updated_at = ?, "
+                "attempts = attempts + ? WHERE url = ?",
+                (state, error, time.time(), 1 if stage == "fetch" else 0, url),
+            )
+            if markdown is not None:
+                self._db.execute("UPDATE pages SET markdown = ? WHERE url = ?", (markdown, url))
+            if listings is not None:
+                self._db.execute("UPDATE pages SET listings = ? WHERE url = ?", (json.dumps(listings), url))
+            if content_hash is not None:
+                # New content invalidates the listings extracted from the old
+                self._db.execute(
+                    "UPDATE pages SET changed_at = ?, extract_state = NULL WHERE url = ? AND content_hash IS NOT ?",
+                    (time.time(), url, content_hash),
+                )
+                self._db.execute("UPDATE pages SET content_hash = ? WHERE url = ?", (content_hash, url))
+            self._db.commit()
+
+    def urls(self) -> List[str]:
+        """Every URL in the journal."""
+        with self._lock:
+            return [url for url, in self._db.execute("SELECT url FROM pages ORDER BY url")]
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """Count pages per state for each stage."""
+        counts = {}
+        with self._lock:
+            for stage in STAGES:
+                rows = self._db.execute(
+                    f"SELECT COALESCE({stage}_state, 'pending'), COUNT(*) FROM pages GROUP BY 1"
+                ).fetchall()
+                counts[stage] = dict(rows)
+        return counts
+
+    def failed(self) -> List[Dict[str, Any]]:
+        """URLs with a failed stage, and the last error recorded for them."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT url, fetch_state, markdown_state, extract_state, error FROM pages "
+                "WHERE 'failed' IN (fetch_state, markdown_state, extract_state) ORDER BY url"
+            ).fetchall()
+        return [
+            {"url": url, "fetch": f, "markdown": m, "extract": e, "error": error}
+            for url, f, m, e, error in rows
+        ]
+
+    def reset(self, failed_only: bool = False) -> int:
+        """Forget pages (only the failed ones with ``failed_only``) so they are crawled afresh."""
+        with self._lock:
+            if failed_only:
+                cursor = self._db.execute(
+                    "DELETE FROM pages WHERE 'failed' IN (fetch_state, markdown_state, extract_state)"
+                )
+            else:
+                cursor = self._db.execute("DELETE FROM pages")
+            self._db.commit()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "CrawlJournal":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class RecrawlReport:
+    """How the pages of a recrawl compare with the content hashes in the journal.
+
+    Each fetched page is ``added`` (not in the journal, or journaled without
+    a hash), ``changed`` or ``unchanged``; pages that could not be fetched
+    are ``failed``. URLs in the journal that the recrawl never visited are
+    reported as ``removed``: that means "not in this run", so recrawling a
+    subset of the catalog reports every other journaled URL as removed.
+    """
+
+    STATUSES = ("unchanged", "changed", "added", "failed")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.seen = set()
+        self.pages = {status: [] for status in self.STATUSES}
+
+    def visit(self, url: str) -> None:
+        with self._lock:
+            self.seen.add(url)
+
+    def classify(self, url: str, previous_hash: Optional[str], content_hash: str) -> str:
+        if previous_hash is None:
+            status = "added"
+        else:
+            status = "unchanged" if previous_hash == content_hash else "changed"
+        self.add(url, status)
+        return status
+
+    def add(self, url: str, status: str) -> None:
+        with self._lock:
+            self.pages[status].append(url)
+
+    def summary(self, known_urls: List[str]) -> Dict[str, Any]:
+        with self._lock:
+            pages = {status: sorted(urls) for status, urls in self.pages.items()}
+            pages["removed"] = sorted(set(known_urls) - self.seen)
+        return {"counts": {status: len(urls) for status, urls in pages.items()}, "pages": pages}
+
+
+if __name__ == "__main__":
+    commands = ("summary", "failed", "reset", "reset-failed")
+    if len(sys.argv) != 3 or sys.argv[2] not in commands:
+        print(f"Usage: python crawl_journal.py <journal.db> {{{'|'.join(commands)}}}")
+    else:
+        with CrawlJournal(sys.argv[1]) as journal:
+            command = sys.argv[2]
+            if command == "summary":
+                print(json.dumps(journal.summary(), indent=4))
+            elif command == "failed":
+                for entry in journal.failed():
+                    print(f"{entry['url']}\tfetch={entry['fetch']}\tmarkdown={entry['markdown']}\t"
+                          f"extract={entry['extract']}\t{entry['error'] or ''}")
+            else:
+                removed = journal.reset(failed_only=command == "reset-failed")
+                print(f"Removed {removed} pages from {sys.argv[1]}")
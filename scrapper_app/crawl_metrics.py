@@ -0,0 +1,160 @@
+import os
+import json
+import time
+import threading
+import logging
+from typing import Any, Dict, List
+
+# Per-page durations that get p50/p95 in the summary, as (telemetry key, stage label)
+STAGE_KEYS = [
+    ("fetch_seconds", "fetch"),
+    ("markdown_seconds", "markdown"),
+    ("extract_seconds", "extract"),
+    ("save_seconds", "save"),
+]
+
+# Per-page counts summed into crawl totals
+TOTAL_KEYS = [
+    "bytes_fetched",
+    "bytes_transferred",
+    "requests_blocked",
+    "markdown_chars",
+    "llm_requests",
+    "llm_retries",
+    "prompt_tokens",
+    "completion_tokens",
+    "rate_limited",
+    "rate_limit_wait",
+]
+
+
+def _quantile(ordered: List[float], q: float) -> float:
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)] if ordered else 0.0
+
+
+class CrawlMetrics:
+    """Structured per-URL metrics for one crawl run.
+
+    ``record`` appends each page's telemetry (stage durations, bytes fetched,
+    markdown size, token usage, retries and rate-limit waits) as one line of
+    ``jsonl_path`` and folds it into running totals. ``write`` exports the
+    totals and per-stage latency percentiles as a JSON summary and, when
+    given a path, a Prometheus textfile for node_exporter's textfile collector.
+    """
+
+    def __init__(self, jsonl_path: str):
+        self.jsonl_path = jsonl_path
+        os.makedirs(os.path.dirname(jsonl_path) or ".", exist_ok=True)
+        self._file = open(jsonl_path, "w", encoding="utf-8")
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.pages: Dict[str, int] = {}
+        self.fetchers: Dict[str, int] = {}
+        self.totals = {key: 0 for key in TOTAL_KEYS}
+        self.durations: Dict[str, List[float]] = {stage: [] for _, stage in STAGE_KEYS}
+
+    def record(self, url: str, status: str, telemetry: Dict[str, Any]) -> None:
+        """Record the outcome of one page: ``ok``, ``no_listings``, ``fetch_failed`` or ``skipped``."""
+        entry = dict(telemetry, url=url, status=status)
+        with self._lock:
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+            self.pages[status] = self.pages.get(status, 0) + 1
+            if "fetcher" in telemetry:
+                self.fetchers[telemetry["fetcher"]] = self.fetchers.get(telemetry["fetcher"], 0) + 1
+            for key in TOTAL_KEYS:
+                self.totals[key] += telemetry.get(key, 0)
+            for key, stage in STAGE_KEYS:
+                if key in telemetry:
+                    self.durations[stage].append(telemetry[key])
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            elapsed = time.time() - self.started
+            done = sum(count for status, count in self.pages.items() if status != "skipped")
+            stages = {}
+            for stage, values in self.durations.items():
+                ordered = sorted(values)
+                stages[stage] = {
+                    "count": len(ordered),
+                    "sum": sum(ordered),
+                    "p50": _quantile(ordered, 0.5),
+                    "p95": _quantile(ordered, 0.95),
+                }
+            return {
+                "started_at": self.started,
+                "duration_seconds": elapsed,
+                "pages": dict(self.pages),
+                "pages_per_minute": done / elapsed * 60 if elapsed else 0.0,
+                "fetchers": dict(self.fetchers),
+                "totals": dict(self.totals),
+                "stages": stages,
+            }
+
+    def prometheus(self, summary: Dict[str, Any]) -> str:
+        """Render a summary in the Prometheus text exposition format."""
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples: List[tuple]) -> None:
+            lines.append(f"# HELP scraper_{name} {help_text}")
+            lines.append(f"# TYPE scraper_{name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"scraper_{name}{{{label_text}}} {value}" if label_text else f"scraper_{name} {value}")
+
+        totals = summary["totals"]
+        metric("pages", "gauge", "Pages in the last crawl by outcome.",
+               [({"status": status}, count) for status, count in sorted(summary["pages"].items())])
+        metric("pages_per_minute", "gauge", "Throughput of the last crawl.", [({}, summary["pages_per_minute"])])
+        metric("crawl_duration_seconds", "gauge", "Wall time of the last crawl.", [({}, summary["duration_seconds"])])
+        metric("last_run_timestamp_seconds", "gauge", "When the last crawl started.", [({}, summary["started_at"])])
+        metric("stage_seconds", "summary", "Per-page duration of each crawl stage.",
+               [({"stage": stage, "quantile": q}, stats[key])
+                for stage, stats in summary["stages"].items() for q, key in (("0.5", "p50"), ("0.95", "p95"))])
+        lines.extend(f'scraper_stage_seconds_sum{{stage="{stage}"}} {stats["sum"]}'
+                     for stage, stats in summary["stages"].items())
+        lines.extend(f'scraper_stage_seconds_count{{stage="{stage}"}} {stats["count"]}'
+                     for stage, stats in summary["stages"].items())
+        metric("fetched_bytes", "gauge", "HTML bytes fetched.", [({}, totals["bytes_fetched"])])
+        metric("transferred_bytes", "gauge", "Bytes Chrome downloaded, subresources included.",
+               [({}, totals["bytes_transferred"])])
+        metric("blocked_requests", "gauge", "Subresource requests Chrome blocked.", [({}, totals["requests_blocked"])])
+        metric("markdown_chars", "gauge", "Markdown characters produced.", [({}, totals["markdown_chars"])])
+        metric("llm_requests", "gauge", "Chat completion requests sent.", [({}, totals["llm_requests"])])
+        metric("llm_retries", "gauge", "Extraction attempts retried.", [({}, totals["llm_retries"])])
+        metric("llm_tokens", "gauge", "Tokens reported by the API.",
+               [({"kind": "prompt"}, totals["prompt_tokens"]), ({"kind": "completion"}, totals["completion_tokens"])])
+        metric("llm_rate_limited", "gauge", "Requests rejected with a 429.", [({}, totals["rate_limited"])])
+        metric("llm_rate_limit_wait_seconds", "gauge", "Time spent waiting for rate-limit budget.",
+               [({}, totals["rate_limit_wait"])])
+        return "\n".join(lines) + "\n"
+
+    def write(self, summary_path: str, textfile_path: str = None) -> Dict[str, Any]:
+        """Write the JSON summary (and Prometheus textfile); returns the summary."""
+        summary = self.summary()
+        summary["per_url"] = self.jsonl_path
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=4)
+        if textfile_path:
+            os.makedirs(os.path.dirname(textfile_path) or ".", exist_ok=True)
+            # Write then rename so the collector never reads a half-written file
+            partial = f"{textfile_path}.tmp"
+            with open(partial, "w", encoding="utf-8") as f:
+                f.write(self.prometheus(summary))
+            os.replace(partial, textfile_path)
+        logging.info(
+            f"Crawl metrics: {summary['pages_per_minute']:.1f} pages/min, "
+            f"{summary['totals']['prompt_tokens']} prompt + {summary['totals']['completion_tokens']} completion tokens, "
+            f"{summary['totals']['rate_limited']} rate limited; written to {summary_path}"
+        )
+        return summary
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> "CrawlMetrics":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,238 @@
+import os
+import queue
+import shutil
+import signal
+import tempfile
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+
+from selenium import webdriver
+
+# Every pooled browser gets a profile directory under this prefix so that its
+# Chrome processes can be found (and killed) from /proc even after a crash.
+PROFILE_PREFIX = "scraper-chrome-"
+
+
+class PooledDriver:
+    """A WebDriver plus the bookkeeping the pool uses to decide when to recycle it."""
+
+    def __init__(self, driver: webdriver.Chrome, profile_dir: str):
+        self.driver = driver
+        self.profile_dir = profile_dir
+        self.pages = 0
+        self.created_at = time.time()
+
+
+def _read_proc(pid: str, name: str) -> bytes:
+    with open(f"/proc/{pid}/{name}", "rb") as f:
+        return f.read()
+
+
+def _list_pids() -> List[str]:
+    if not os.path.isdir("/proc"):
+        return []
+    return [p for p in os.listdir("/proc") if p.isdigit()]
+
+
+def _parent_pid(pid: str) -> int:
+    # The command name in /proc/<pid>/stat may contain spaces, so split after it
+    stat = _read_proc(pid, "stat").decode(errors="ignore")
+    return int(stat.rsplit(")", 1)[1].split()[1])
+
+
+def find_profile_processes(marker: str) -> List[int]:
+    """Return PIDs of processes whose command line mentions the given profile marker."""
+    needle = marker.encode()
+    pids = []
+    for pid in _list_pids():
+        try:
+            if needle in _read_proc(pid, "cmdline"):
+                pids.append(int(pid))
+        except OSError:
+            continue
+    return pids
+
+
+def process_rss_mb(pids: List[int]) -> float:
+    """Sum the resident memory of the given processes in megabytes (0 where /proc is unavailable)."""
+    total_kb = 0
+    for pid in pids:
+        try:
+            for line in _read_proc(str(pid), "status").decode(errors="ignore").splitlines():
+                if line.startswith("VmRSS:"):
+                    total_kb += int(line.split()[1])
+                    break
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024
+
+
+def kill_processes(pids: List[int]) -> int:
+    """Send SIGKILL to each PID, returning how many were signalled."""
+    killed = 0
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGKILL)
+            killed += 1
+        except (OSError, AttributeError):
+            continue
+    return killed
+
+
+class DriverPool:
+    """Pool of long-lived Chrome WebDrivers that are leased per URL and recycled.
+
+    A driver is retired after ``max_pages`` page loads, when its Chrome process
+    tree grows past ``max_memory_mb``, or when it stops answering. Retired
+    browsers that fail to quit cleanly are killed by profile directory.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[Optional[str]], webdriver.Chrome],
+        size: int = 1,
+        max_pages: int = 50,
+        max_memory_mb: float = 1500,
+    ):
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self._idle: "queue.Queue[PooledDriver]" = queue.Queue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._live: List[PooledDriver] = []
+        self._closed = False
+        self.stats = {"started": 0, "recycled": 0, "reaped": 0, "leases": 0}
+
+    def __enter__(self) -> "DriverPool":
+        self.reap_orphans()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @contextmanager
+    def lease(self):
+        """Lease a driver for one page; it goes back to the pool (or is recycled) afterwards."""
+        pooled = self._acquire()
+        try:
+            yield pooled.driver
+        finally:
+            pooled.pages += 1
+            self._release(pooled)
+
+    def _acquire(self) -> PooledDriver:
+        if self._closed:
+            raise RuntimeError("DriverPool is closed")
+        self._slots.acquire()
+        try:
+            pooled = self._idle.get_nowait()
+        except queue.Empty:
+            try:
+                pooled = self._spawn()
+            except Exception:
+                self._slots.release()
+                raise
+        with self._lock:
+            self.stats["leases"] += 1
+        return pooled
+
+    def _release(self, pooled: PooledDriver) -> None:
+        try:
+            reason = self._recycle_reason(pooled)
+            if reason or self._closed:
+                logging.info(f"Recycling browser after {pooled.pages} pages ({reason or 'pool closed'})")
+                self._retire(pooled)
+                with self._lock:
+                    self.stats["recycled"] += 1
+            else:
+                self._idle.put(pooled)
+        finally:
+            self._slots.release()
+
+    def _spawn(self) -> PooledDriver:
+        profile_dir = tempfile.mkdtemp(prefix=PROFILE_PREFIX)
+        try:
+            driver = self.factory(profile_dir)
+        except Exception:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            raise
+        pooled = PooledDriver(driver, profile_dir)
+        with self._lock:
+            self._live.append(pooled)
+            self.stats["started"] += 1
+        logging.info(f"Started pooled browser ({len(self._live)}/{self.size} live)")
+        return pooled
+
+    def _recycle_reason(self, pooled: PooledDriver) -> Optional[str]:
+        if self.max_pages and pooled.pages >= self.max_pages:
+            return f"page limit {self.max_pages}"
+        try:
+            pooled.driver.current_url  # Cheap liveness probe
+        except Exception:
+            return "browser unresponsive"
+        if self.max_memory_mb:
+            rss = process_rss_mb(find_profile_processes(pooled.profile_dir))
+            if rss > self.max_memory_mb:
+                return f"memory {rss:.0f}MB > {self.max_memory_mb}MB"
+        return None
+
+    def _retire(self, pooled: PooledDriver) -> None:
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logging.warning(f"Error quitting browser: {e}")
+        leftovers = kill_processes(find_profile_processes(pooled.profile_dir))
+        if leftovers:
+            logging.warning(f"Reaped {leftovers} leftover Chrome processes")
+            with self._lock:
+                self.stats["reaped"] += leftovers
+        shutil.rmtree(pooled.profile_dir, ignore_errors=True)
+        with self._lock:
+            if pooled in self._live:
+                self._live.remove(pooled)
+
+    def reap_orphans(self) -> int:
+        """Kill pooled Chrome processes whose driver died or whose profile was already removed."""
+        with self._lock:
+            owned = {p.profile_dir for p in self._live}
+        root = os.path.join(tempfile.gettempdir(), PROFILE_PREFIX)
+        orphans = []
+        for pid in find_profile_processes(root):
+            try:
+                cmdline = _read_proc(str(pid), "cmdline").decode(errors="ignore")
+                parent = _parent_pid(str(pid))
+            except (OSError, ValueError, IndexError):
+                continue
+            args = cmdline.split("\0")
+            profile = next((a.split("=", 1)[1] for a in args if a.startswith("--user-data-dir=")), "")
+            if profile in owned:
+                continue
+            # Reparented to init, or its profile directory is gone: nobody will quit it
+            if parent == 1 or not os.path.isdir(profile):
+                orphans.append(pid)
+        killed = kill_processes(orphans)
+        if killed:
+            logging.info(f"Reaped {killed} orphaned Chrome processes")
+            with self._lock:
+                self.stats["reaped"] += killed
+        return killed
+
+    def close(self) -> None:
+        """Quit every pooled browser and reap anything left over."""
+        self._closed = True
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._retire(pooled)
+        self.reap_orphans()
+        logging.info(
+            f"Driver pool closed: {self.stats['started']} browsers started for "
+            f"{self.stats['leases']} pages, {self.stats['recycled']} recycled, {self.stats['reaped']} processes reaped"
+        )
@@ -0,0 +1,181 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+import logging
+from typing import Callable, Dict, Optional
+
+import requests
+
+
+class FetchCache:
+    """On-disk cache of fetched HTML, keyed by URL and stored by content hash.
+
+    Pages are written once under ``objects/`` by their SHA-256 digest (URLs
+    with identical content share a file) and indexed in SQLite. An entry
+    younger than ``ttl`` seconds is served as is; an older one is revalidated
+    with a conditional GET when the origin sent an ETag or Last-Modified.
+    ``get(url, revalidate=True)`` treats every entry as older than ``ttl``.
+    When the origin answers the conditional GET with a new page that the
+    caller's ``accept`` check passes, that body is stored and returned, so
+    the page is not downloaded a second time.
+    The least recently used entries are evicted past ``max_bytes``.
+    """
+
+    def __init__(self, root: str, ttl: float = 24 * 3600, max_bytes: int = 500 * 1024 * 1024,
+                 revalidate_timeout: float = 10):
+        self.root = root
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.revalidate_timeout = revalidate_timeout
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(root, "index.db"), check_same_thread=False)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._db.commit()
+        self._session = requests.Session()
+        self.stats = {
+            "hits": 0, "misses": 0, "revalidated": 0, "refreshed": 0, "stale": 0, "stores": 0, "evictions": 0
+        }
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.html")
+
+    def _read(self, digest: str) -> Optional[str]:
+        try:
+            with open(self._object_path(digest), "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def get(self, url: str, revalidate: bool = False, accept: Callable[[str], bool] = None) -> Optional[str]:
+        """Return cached HTML for ``url`` if it is fresh or revalidates, else ``None``.
+
+        With ``revalidate`` the TTL is ignored. The entry is served only if
+        a conditional GET says it is not modified. If that GET returns a new
+        page instead, the page is cached and returned when ``accept(html)``
+        is true. Without ``accept`` the new page is discarded and the lookup
+        is a miss.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT digest, etag, last_modified, fetched_at FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return self._miss()
+        digest, etag, last_modified, fetched_at = row
+        now = time.time()
+        if revalidate or now - fetched_at > self.ttl:
+            response = self._conditional_get(url, etag, last_modified) if etag or last_modified else None
+            if response is not None and response.status_code == 200 and accept and accept(response.text):
+                self.put(url, response.text, response.headers)
+                with self._lock:
+                    self.stats["refreshed"] += 1
+                return response.text
+            if response is None or response.status_code != 304:
+                with self._lock:
+                    self.stats["stale"] += 1
+                return self._miss()
+            with self._lock:
+                self.stats["revalidated"] += 1
+                self._db.execute("UPDATE entries SET fetched_at = ? WHERE url = ?", (now, url))
+        html = self._read(digest)
+        if html is None:
+            return self._miss()
+        with self._lock:
+            self.stats["hits"] += 1
+            self._db.execute("UPDATE entries SET accessed_at = ? WHERE url = ?", (now, url))
+            self._db.commit()
+        return html
+
+    def _miss(self) -> None:
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def _conditional_get(
+        self, url: str, etag: Optional[str], last_modified: Optional[str]
+    ) -> Optional[requests.Response]:
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        try:
+            return self._session.get(url, headers=headers, timeout=self.revalidate_timeout)
+        except requests.RequestException as e:
+            logging.warning(f"Could not revalidate cached {url}: {e}")
+            return None
+
+    def put(self, url: str, html: str, headers: Optional[Dict[str, str]] = None) -> None:
+        """Store HTML for ``url``, keeping any validators from the response ``headers``."""
+        if not html:
+            return
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, digest, len(data), headers.get("etag"), headers.get("last-modified"), now, now),
+            )
+            self._db.commit()
+            self.stats["stores"] += 1
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            total = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM entries)"
+            ).fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            rows = self._db.execute("SELECT url, digest, size FROM entries ORDER BY accessed_at").fetchall()
+            for url, digest, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+                self.stats["evictions"] += 1
+                shared = self._db.execute("SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)).fetchone()
+                if not shared:
+                    total -= size
+                    try:
+                        os.remove(self._object_path(digest))
+                    except OSError:
+                        pass
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+        self._session.close()
+        lookups = self.stats["hits"] + self.stats["refreshed"] + self.stats["misses"]
+        logging.info(
+            f"Fetch cache: {self.stats['hits']}/{lookups} hits ({self.stats['revalidated']} revalidated), "
+            f"{self.stats['refreshed']} refreshed by revalidation, {self.stats['stale']} stale, {self.stats['stores']} stored, {self.stats['evictions']} evicted"
+        )
+
+    def __enter__(self) -> "FetchCache":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
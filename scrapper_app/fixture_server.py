@@ -0,0 +1,66 @@
+import os
+import sys
+import threading
+import logging
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """Serve saved pages so that ``/schemes/<slug>`` maps to ``<root>/<slug>.html``."""
+
+    def translate_path(self, path: str) -> str:
+        path = urlparse(path).path
+        if path.startswith("/schemes/"):
+            slug = os.path.basename(path.rstrip("/"))
+            return os.path.join(self.directory, f"{slug}.html")
+        return super().translate_path(path)
+
+    def log_message(self, format, *args) -> None:
+        logging.debug(f"Fixture server: {format % args}")
+
+
+class FixtureServer:
+    """Local HTTP server for saved scheme pages, run on a background thread."""
+
+    def __init__(self, root: str, host: str = "127.0.0.1", port: int = 0, handler=FixtureHandler):
+        self.root = os.path.abspath(root)
+        self.httpd = ThreadingHTTPServer((host, port), partial(handler, directory=self.root))
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url_for(self, slug: str) -> str:
+        """URL under which the fixture page for ``slug`` is served."""
+        return f"{self.base_url}/schemes/{slug}"
+
+    def start(self) -> "FixtureServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python fixture_server.py <pages_dir> [port]")
+    else:
+        logging.basicConfig(level=logging.DEBUG)
+        server = FixtureServer(sys.argv[1], port=int(sys.argv[2]) if len(sys.argv) == 3 else 8765)
+        print(f"Serving {server.root} at {server.base_url}/schemes/<slug>")
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            server.httpd.server_close()
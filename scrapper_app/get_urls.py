@@ -1,64 +1,71 @@
+import sys
 import json
+import hashlib
 
-def extract_slugs(json_file_path):
-    slugs = []
-    try:
-        with open(json_file_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-        
-        # Data is a list of objects
-        for obj in data:
-            # Navigate to hits.items
-            items = obj.get('data', {}).get('hits', {}).get('items', [])
-            for item in items:
-                slug = item.get('fields', {}).get('slug')
-                if slug:
-                    slugs.append(slug)
-                
-        return slugs
-    
-    except FileNotFoundError:
-        print(f"Error: File '{json_file_path}' not found")
-        return []
-    except json.JSONDecodeError:
-        print(f"Error: Invalid JSON format in '{json_file_path}'")
-        return []
-    except UnicodeDecodeError:
-        print(f"Error: Could not decode file with UTF-8 encoding. Trying alternative encoding...")
+from json_stream import iter_array
+
+BASE_URL = "https://www.myscheme.gov.in/schemes/"
+
+
+def _slug_key(slug):
+    # 8-byte digests keep each seen-set entry small however long the slugs are
+    return hashlib.blake2b(slug.encode("utf-8"), digest_size=8).digest()
+
+
+def iter_slugs(json_file_paths, seen=None):
+    """Yield unique slugs from ``data.hits.items[].fields.slug`` of catalog dumps.
+
+    Each file is a JSON array of search API responses and is parsed one
+    response at a time, so the whole dump is never held in memory. Slugs
+    already in ``seen`` (a set of digests, shared across files) are skipped.
+
+    Deduplication is exact, so memory is not constant: ``seen`` grows by
+    about 80 bytes per unique slug (roughly 8 MB per 100,000 schemes). A
+    fixed-size Bloom filter was rejected because each false positive would
+    silently drop a real scheme from the crawl.
+    """
+    seen = set() if seen is None else seen
+    if isinstance(json_file_paths, str):
+        json_file_paths = [json_file_paths]
+    for json_file_path in json_file_paths:
         try:
-            with open(json_file_path, 'r', encoding='latin-1') as file:
-                data = json.load(file)
-            for obj in data:
-                items = obj.get('data', {}).get('hits', {}).get('items', [])
-                for item in items:
-                    slug = item.get('fields', {}).get('slug')
-                    if slug:
-                        slugs.append(slug)
-            return slugs
-        except Exception as e:
-            print(f"Error extracting slugs with alternative encoding: {str(e)}")
-            return []
-    except Exception as e:
-        print(f"Error extracting slugs: {str(e)}")
-        return []
+            with open(json_file_path, 'rb') as file:
+                for obj in iter_array(file):
+                    items = obj.get('data', {}).get('hits', {}).get('items', [])
+                    for item in items:
+                        slug = item.get('fields', {}).get('slug')
+                        if not slug:
+                            continue
+                        key = _slug_key(slug)
+                        if key not in seen:
+                            seen.add(key)
+                            yield slug
+        except FileNotFoundError:
+            print(f"Error: File '{json_file_path}' not found")
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"Error: Invalid JSON format in '{json_file_path}': {e}")
+
+
+def iter_urls(json_file_paths):
+    """Lazily yield scheme URLs for the unique slugs in the given catalog dumps."""
+    for slug in iter_slugs(json_file_paths):
+        yield BASE_URL + slug
+
+
+def extract_slugs(json_file_path):
+    return list(iter_slugs(json_file_path))
+
 
 def generate_urls(slugs):
-    base_url = "https://www.myscheme.gov.in/schemes/"
-    return [base_url + slug for slug in slugs]
+    return [BASE_URL + slug for slug in slugs]
+
 
 if __name__ == "__main__":
-    json_file_path = r"C:\Users\nites\OneDrive\Desktop\Scrapping\Sunny\all2.json"
-    
-    slugs = extract_slugs(json_file_path)
-    
-    if slugs:
-        print("Extracted slugs:")
-        for slug in slugs:
-            print(slug)
-        
-        print("\nGenerated URLs:")
-        urls = generate_urls(slugs)
-        for url in urls:
-            print(url)
+    if len(sys.argv) < 2:
+        print("Usage: python get_urls.py <catalog.json> [<catalog.json> ...]")
     else:
-        print("No slugs extracted")
\ No newline at end of file
+        count = 0
+        for url in iter_urls(sys.argv[1:]):
+            print(url)
+            count += 1
+        print(f"{count} unique scheme URLs", file=sys.stderr)
@@ -0,0 +1,159 @@
+import re
+import hashlib
+import logging
+from typing import Optional
+
+import html2text
+from bs4 import BeautifulSoup
+from html2text.utils import pad_tables_in_text
+from lxml import etree, html as lxml_html
+
+_MAIN_OPEN = re.compile(r"<main[\s>]", re.I)
+_MAIN_CLOSE = re.compile(r"</main\s*>", re.I)
+# Characters html.parser sees as entity references in serialized HTML text
+_ESCAPED = re.compile(r"([&<>])")
+# Elements whose text html.parser passes through unsplit
+_RAW_TEXT = {"script", "style"}
+
+
+def main_fragment(html_content: str) -> Optional[etree._Element]:
+    """Parse only the page's ``<main>`` element with lxml.
+
+    The element is cut out of the raw HTML by position, so the head (with its
+    large inline scripts) and everything outside ``<main>`` is never parsed.
+    Returns ``None`` unless the page has exactly one ``<main>`` element and
+    it parses without errors, since lxml and html.parser repair broken
+    markup differently.
+    """
+    opens = _MAIN_OPEN.findall(html_content)
+    closes = list(_MAIN_CLOSE.finditer(html_content))
+    if len(opens) != 1 or len(closes) != 1:
+        return None
+    start = _MAIN_OPEN.search(html_content).start()
+    end = closes[0].end()
+    if end <= start:
+        return None
+    parser = lxml_html.HTMLParser()
+    try:
+        element = lxml_html.fragment_fromstring(html_content[start:end], parser=parser)
+    except (etree.ParserError, ValueError):
+        return None
+    if len(parser.error_log) or element.tag != "main":
+        return None
+    return element
+
+
+def _feed_text(converter: html2text.HTML2Text, text: str, raw: bool) -> None:
+    if not text:
+        return
+    if raw:
+        converter.handle_data(text)
+        return
+    # Split exactly where serialized HTML would hold &amp;, &lt; or &gt;, so
+    # html2text applies the same escaping as when it parses markup
+    for n, part in enumerate(_ESCAPED.split(text)):
+        if n % 2:
+            converter.handle_data(part, True)
+        elif part:
+            converter.handle_data(part)
+
+
+def _walk(converter: html2text.HTML2Text, element: etree._Element) -> None:
+    if isinstance(element.tag, str):
+        tag = element.tag.lower()
+        converter.handle_starttag(tag, list(element.attrib.items()))
+        _feed_text(converter, element.text, tag in _RAW_TEXT)
+        for child in element:
+            _walk(converter, child)
+            _feed_text(converter, child.tail, tag in _RAW_TEXT)
+        converter.handle_endtag(tag)
+    # Comments and processing instructions produce no output; their tails are fed by the parent
+
+
+def convert_tree(converter: html2text.HTML2Text, element: etree._Element) -> str:
+    """Run ``converter`` over an lxml element directly, without serializing it back to HTML.
+
+    Produces the same markdown as ``converter.handle(str(soup_element))`` for
+    the equivalent BeautifulSoup element.
+    """
+    converter.start = True
+    _walk(converter, element)
+    markdown = converter.optwrap(converter.finish())
+    if converter.pad_tables:
+        return pad_tables_in_text(markdown)
+    return markdown
+
+
+def clean_html(html_content: str) -> str:
+    """Remove headers, footers, scripts, and styles from HTML but keep main content."""
+    try:
+        soup = BeautifulSoup(html_content, "html.parser")
+        
+        # Try to focus on main content (improved targeting)
+        main_content = soup.find("main") or soup.find(id=re.compile("content|main", re.I)) or soup.find(class_=re.compile("content|main", re.I))
+        
+        # If found main content, use it instead of the whole page
+        if main_content:
+            return str(main_content)
+            
+        # Otherwise clean the whole page
+        for element in soup.find_all(["script", "style", "nav", "footer"]):
+            element.decompose()
+        
+        return str(soup)
+    except Exception as e:
+        logging.error(f"Error cleaning HTML: {e}")
+        return html_content
+
+
+def remove_urls(text: str) -> str:
+    """Remove URLs from text using regex."""
+    url_pattern = r"http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+"
+    return re.sub(url_pattern, "", text)
+
+
+def markdown_converter() -> html2text.HTML2Text:
+    """html2text settings used for every page."""
+    converter = html2text.HTML2Text()
+    converter.ignore_links = False  # Keep links for context
+    converter.ignore_images = True
+    converter.body_width = 0  # Don't wrap text
+    return converter
+
+
+def html_to_markdown(html_content: str) -> str:
+    """Convert cleaned HTML to markdown and remove URLs.
+
+    Pages with a single ``<main>`` element take the fast path: only that
+    element is parsed (with lxml) and converted straight from the tree. Other
+    pages go through ``clean_html``.
+    """
+    if not html_content:
+        return ""
+    converter = markdown_converter()
+    main = main_fragment(html_content)
+    if main is not None:
+        markdown = convert_tree(converter, main)
+    else:
+        markdown = converter.handle(clean_html(html_content))
+    
+    # Some basic cleaning to improve readability
+    markdown = re.sub(r'\n{3,}', '\n\n', markdown)  # Remove excessive newlines
+    markdown = remove_urls(markdown)
+    
+    return markdown
+
+
+def normalize_markdown(markdown: str) -> str:
+    """Markdown reduced to its content: runs of whitespace collapsed and blank lines dropped.
+
+    html2text's line wrapping and spacing can shift with incidental markup
+    changes, which should not count as the page changing.
+    """
+    lines = (" ".join(line.split()) for line in markdown.splitlines())
+    return " ".join(line for line in lines if line)
+
+
+def content_hash(markdown: str) -> str:
+    """SHA-256 of ``normalize_markdown(markdown)``."""
+    return hashlib.sha256(normalize_markdown(markdown).encode("utf-8")).hexdigest()
@@ -0,0 +1,106 @@
+import asyncio
+import random
+import re
+import logging
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from background_loop import BackgroundLoop
+
+# Sections every myscheme.gov.in scheme page shows; a response without them
+# was not server-rendered and needs a real browser.
+REQUIRED_SECTIONS = ["Details", "Benefits", "Eligibility", "Application Process"]
+
+
+def has_required_sections(html: str, sections: List[str] = REQUIRED_SECTIONS) -> bool:
+    """Check whether the page's <main> element already contains every required section."""
+    if not html:
+        return False
+    main = re.search(r"<main[\s>][\s\S]*?</main>", html, re.I)
+    if not main:
+        return False
+    text = re.sub(r"<[^>]+>", " ", main.group(0))
+    return all(re.search(rf"\b{re.escape(section)}\b", text, re.I) for section in sections)
+
+
+class HttpPage:
+    """Result of a plain HTTP fetch."""
+
+    def __init__(self, url: str, status: int, html: str, headers: Dict[str, str]):
+        self.url = url
+        self.status = status
+        self.html = html
+        self.headers = headers
+
+
+class AsyncHttpFetcher:
+    """Browserless page fetcher sharing one keep-alive connection pool.
+
+    Use ``fetch_page``/``fetch_all`` from async code, or ``fetch`` from the
+    threaded crawl stages, which runs on the shared BackgroundLoop.
+    """
+
+    def __init__(
+        self,
+        user_agents: List[str],
+        max_connections: int = 8,
+        timeout: float = 20,
+        loop: Optional[BackgroundLoop] = None,
+    ):
+        self.user_agents = user_agents
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._owns_loop = loop is None
+        self.loop = loop or BackgroundLoop()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.stats = {"requests": 0, "errors": 0, "bytes": 0}
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=30),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def fetch_page(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[HttpPage]:
+        """GET a URL over the pooled session; returns ``None`` on network errors."""
+        session = await self._get_session()
+        request_headers = {"User-Agent": random.choice(self.user_agents), "Accept": "text/html,*/*"}
+        request_headers.update(headers or {})
+        self.stats["requests"] += 1
+        try:
+            async with session.get(url, headers=request_headers) as response:
+                body = await response.read()
+                self.stats["bytes"] += len(body)
+                html = body.decode(response.charset or "utf-8", errors="replace")
+                return HttpPage(url, response.status, html, dict(response.headers))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.stats["errors"] += 1
+            logging.warning(f"HTTP fetch failed for {url}: {e}")
+            return None
+
+    async def fetch_all(self, urls: List[str]) -> List[Optional[HttpPage]]:
+        """Fetch several URLs concurrently, bounded by the connection pool size."""
+        return await asyncio.gather(*(self.fetch_page(url) for url in urls))
+
+    def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[HttpPage]:
+        """Blocking wrapper around ``fetch_page`` for use from worker threads."""
+        return self.loop.run(self.fetch_page(url, headers))
+
+    async def _close_session(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    def close(self) -> None:
+        """Close the connection pool (and the loop, if this fetcher started it)."""
+        self.loop.run(self._close_session())
+        if self._owns_loop:
+            self.loop.close()
+
+    def __enter__(self) -> "AsyncHttpFetcher":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,141 @@
+import json
+import codecs
+from typing import Any, BinaryIO, Iterator
+
+# Byte order marks checked before falling back to a UTF-8 trial decode
+_BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+# Bytes read up front to guess the encoding from
+SNIFF_BYTES = 64 * 1024
+
+_WHITESPACE = " \t\r\n"
+
+
+def sniff_encoding(sample: bytes) -> str:
+    """Guess a file's encoding from its first bytes: BOM, then UTF-8, then latin-1.
+
+    ``sample`` may end in the middle of a multi-byte character; only a
+    decode error before the last few bytes counts against UTF-8.
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    try:
+        sample.decode("utf-8")
+    except UnicodeDecodeError as e:
+        if e.start < len(sample) - 3:
+            return "latin-1"
+    return "utf-8"
+
+
+class _Reader:
+    """Incrementally decoded text of a JSON file with a read position."""
+
+    def __init__(self, file: BinaryIO, chunk_size: int, encoding: str = None):
+        self.file = file
+        self.chunk_size = chunk_size
+        first = file.read(max(chunk_size, SNIFF_BYTES))
+        self.decoder = codecs.getincrementaldecoder(encoding or sniff_encoding(first))(errors="replace")
+        self.parser = json.JSONDecoder()
+        self.buffer = self.decoder.decode(first)
+        self.eof = not first
+        self.pos = 0
+
+    def more(self, read_size: int = None) -> bool:
+        """Append the next chunk to the buffer, dropping what was already consumed."""
+        if self.eof:
+            return False
+        data = self.file.read(read_size or self.chunk_size)
+        self.eof = not data
+        self.buffer = self.buffer[self.pos:] + self.decoder.decode(data, final=self.eof)
+        self.pos = 0
+        return True
+
+    def peek(self, what: str) -> str:
+        """Skip whitespace and return the next character without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.more():
+                raise json.JSONDecodeError(f"Unterminated {what}", self.buffer, self.pos)
+
+    def expect(self, char: str, what: str) -> None:
+        found = self.peek(what)
+        if found != char:
+            raise json.JSONDecodeError(f"Expecting {char!r} in {what}, found {found!r}", self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more of the file as needed."""
+        self.peek("value")
+        read_size = self.chunk_size
+        while True:
+            try:
+                value, end = self.parser.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Most likely the value runs past the buffer; read more (reading
+                # bigger chunks each time so a huge value is not re-parsed often)
+                if self.more(read_size):
+                    read_size *= 2
+                    continue
+                raise
+            if (end == len(self.buffer) and isinstance(value, (int, float)) and not isinstance(value, bool)
+                    and self.more()):
+                # A number cut short by the chunk boundary ("4.5e") still decodes
+                continue
+            self.pos = end
+            return value
+
+    def find_key(self, key: str) -> None:
+        """Inside an object, skip members until just after ``"key":``."""
+        self.expect("{", "object")
+        while True:
+            if self.peek("object") == "}":
+                raise KeyError(key)
+            name = self.value()
+            self.expect(":", "object")
+            if name == key:
+                return
+            self.value()  # Skip the member's value
+            if self.peek("object") == ",":
+                self.pos += 1
+
+
+def iter_array(file: BinaryIO, chunk_size: int = 64 * 1024, encoding: str = None, key: str = None) -> Iterator[Any]:
+    """Yield the elements of a JSON array one at a time.
+
+    The array is the whole document, or with ``key`` the value of that
+    member of a top-level object (e.g. ``{"listings": [...]}``); members
+    before it are parsed and skipped, members after it are not read. The file
+    is read in chunks of ``chunk_size`` bytes and decoded incrementally, so
+    memory is bounded by the largest single element rather than the whole
+    file. The encoding is sniffed once from the first ``SNIFF_BYTES``
+    unless given. Raises ``ValueError`` if the document does not have that
+    shape and ``json.JSONDecodeError`` if it is malformed.
+    """
+    reader = _Reader(file, chunk_size, encoding)
+    if key is not None:
+        if reader.peek("document") != "{":
+            raise ValueError(f"Expected a JSON object with {key!r}, found {reader.peek('document')!r}")
+        try:
+            reader.find_key(key)
+        except KeyError:
+            raise ValueError(f"No {key!r} member in the JSON object") from None
+    if reader.peek("document") != "[":
+        raise ValueError(f"Expected a JSON array, found {reader.peek('document')!r}")
+    reader.pos += 1
+    if reader.peek("array") == "]":
+        return
+    while True:
+        yield reader.value()
+        if reader.peek("array") == "]":
+            return
+        reader.expect(",", "array")
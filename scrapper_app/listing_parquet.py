@@ -0,0 +1,101 @@
+import json
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Key column derived from each listing's URL (the last path segment)
+SLUG_COLUMN = "slug"
+
+# Fields stored as lists of strings; the model and final.json give them as comma-separated text
+LIST_COLUMNS = {"Tags"}
+
+
+def slug_from_url(url: Optional[str]) -> Optional[str]:
+    """``https://www.myscheme.gov.in/schemes/kvy`` -> ``kvy``."""
+    if not url:
+        return None
+    return urlparse(url).path.rstrip("/").rsplit("/", 1)[-1] or None
+
+
+def listing_schema(columns: List[str]) -> pa.Schema:
+    """Nullable columns in the given order, led by the slug key when there is a URL column.
+
+    ``LIST_COLUMNS`` are lists of strings; every other column is a string.
+    """
+    names = ([SLUG_COLUMN] if "URL" in columns and SLUG_COLUMN not in columns else []) + list(columns)
+    return pa.schema([
+        pa.field(name, pa.list_(pa.string()) if name in LIST_COLUMNS else pa.string()) for name in names
+    ])
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def _text_list(value: Any) -> Optional[List[str]]:
+    """A list value as strings; comma-separated text is split into its items."""
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)):
+        return [_text(item) for item in value if item is not None]
+    return [item.strip() for item in str(value).split(",") if item.strip()]
+
+
+class ParquetListingWriter:
+    """Write listings to a zstd-compressed Parquet file one row group at a time.
+
+    Rows are buffered until ``row_group_size`` have accumulated, so memory
+    stays bounded and a reader can skip row groups and project columns.
+    ``LIST_COLUMNS`` hold lists of strings (comma-separated text is split);
+    other values are stored as strings, with lists and dicts as JSON text
+    as in the CSV output. Fields outside ``columns`` are dropped. The file has no
+    footer, and so cannot be read, until ``close``.
+    """
+
+    def __init__(self, path: str, columns: List[str], row_group_size: int = 1000, compression: str = "zstd"):
+        self.path = path
+        self.schema = listing_schema(columns)
+        self.row_group_size = row_group_size
+        self._writer = pq.ParquetWriter(path, self.schema, compression=compression)
+        self._rows: List[Dict[str, Any]] = []
+        self.rows_written = 0
+
+    def write(self, listings: List[Dict[str, Any]]) -> None:
+        for listing in listings:
+            row = {
+                name: (_text_list if name in LIST_COLUMNS else _text)(listing.get(name)) for name in self.schema.names
+            }
+            if SLUG_COLUMN in self.schema.names and row[SLUG_COLUMN] is None:
+                row[SLUG_COLUMN] = slug_from_url(listing.get("URL"))
+            self._rows.append(row)
+        if len(self._rows) >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered rows out as a row group."""
+        if not self._rows:
+            return
+        self._writer.write_table(pa.Table.from_pylist(self._rows, schema=self.schema))
+        self.rows_written += len(self._rows)
+        self._rows = []
+
+    def close(self) -> None:
+        self.flush()
+        self._writer.close()
+
+    def __enter__(self) -> "ParquetListingWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def read_listings(path: str, columns: List[str] = None) -> pa.Table:
+    """Memory-map a listings file and read only ``columns`` (all by default)."""
+    return pq.read_table(path, columns=columns, memory_map=True)
@@ -0,0 +1,92 @@
+import os
+import csv
+import json
+import time
+import threading
+import logging
+from typing import Any, Dict, List
+
+from listing_parquet import ParquetListingWriter
+
+
+class ListingSink:
+    """Append-only JSONL and CSV output for the listings of one crawl run.
+
+    Every listing is written as one JSON line and one CSV row the moment it
+    is added, so memory stays flat however many pages are crawled and the
+    files are always the combined output so far. Writes are flushed to disk
+    (``fsync``) once ``fsync_every`` listings or ``fsync_interval`` seconds
+    have accumulated, and on ``close``. CSV columns are fixed up front to
+    ``columns``; list and dict values are stored as JSON text.
+
+    With ``parquet`` the listings also go to a ``.parquet`` file with the
+    same columns plus a ``slug`` key (see ``ParquetListingWriter``); it is
+    written a row group at a time and only readable after ``close``.
+    """
+
+    def __init__(self, path_prefix: str, columns: List[str], fsync_every: int = 50, fsync_interval: float = 5.0,
+                 parquet: bool = False):
+        self.jsonl_path = f"{path_prefix}.jsonl"
+        self.csv_path = f"{path_prefix}.csv"
+        self.parquet_path = f"{path_prefix}.parquet" if parquet else None
+        self.columns = list(columns)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        os.makedirs(os.path.dirname(self.jsonl_path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._jsonl = open(self.jsonl_path, "w", encoding="utf-8")
+        self._csv_file = open(self.csv_path, "w", encoding="utf-8", newline="")
+        self._csv = csv.DictWriter(self._csv_file, fieldnames=self.columns, extrasaction="ignore")
+        self._csv.writeheader()
+        self._parquet = ParquetListingWriter(self.parquet_path, self.columns) if parquet else None
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+        self.stats = {"listings": 0, "fsyncs": 0}
+
+    @staticmethod
+    def _cell(value: Any) -> Any:
+        return json.dumps(value, ensure_ascii=False) if isinstance(value, (list, dict)) else value
+
+    def write(self, listings: List[Dict[str, Any]]) -> None:
+        """Append listings to both files."""
+        if not listings:
+            return
+        with self._lock:
+            for listing in listings:
+                self._jsonl.write(json.dumps(listing, ensure_ascii=False) + "\n")
+                self._csv.writerow({key: self._cell(value) for key, value in listing.items()})
+            if self._parquet:
+                self._parquet.write(listings)
+            self.stats["listings"] += len(listings)
+            self._unsynced += len(listings)
+            if self._unsynced >= self.fsync_every or time.monotonic() - self._synced_at >= self.fsync_interval:
+                self._sync()
+
+    def _sync(self) -> None:
+        for f in (self._jsonl, self._csv_file):
+            f.flush()
+            os.fsync(f.fileno())
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+        self.stats["fsyncs"] += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._jsonl.closed:
+                return
+            self._sync()
+            self._jsonl.close()
+            self._csv_file.close()
+            if self._parquet:
+                self._parquet.close()
+        logging.info(
+            f"Saved {self.stats['listings']} listings to {self.jsonl_path} and {self.csv_path}"
+            + (f" and {self.parquet_path}" if self.parquet_path else "")
+            + f" ({self.stats['fsyncs']} fsyncs)"
+        )
+
+    def __enter__(self) -> "ListingSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,127 @@
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+import threading
+import logging
+from typing import Any, Dict, List, Optional
+
+
+def extraction_key(markdown: str, system_message: str, model: str, fields: List[str]) -> str:
+    """Hash everything that determines an extraction result."""
+    payload = json.dumps([markdown, system_message, model, list(fields)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ExtractionCache:
+    """SQLite cache of LLM extraction results, bounded to ``max_bytes`` by LRU eviction.
+
+    Results are keyed by ``extraction_key`` so unchanged pages cost no tokens
+    on a rerun, while any change to the page, prompt, model or field list
+    misses the cache.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 200 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                url TEXT,
+                result TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._db.commit()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            self._db.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, result: Dict[str, Any], model: str, url: str = None) -> None:
+        data = json.dumps(result, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, url, data, len(data.encode("utf-8")), now, now),
+            )
+            self.stats["stores"] += 1
+            self._evict()
+            self._db.commit()
+
+    def _evict(self) -> None:
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute("SELECT key, size FROM results ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+            self.stats["evictions"] += 1
+
+    def invalidate(self, model: str = None, url: str = None) -> int:
+        """Drop cached results, optionally only those for one model and/or URL."""
+        clauses, params = [], []
+        if model:
+            clauses.append("model = ?")
+            params.append(model)
+        if url:
+            clauses.append("url = ?")
+            params.append(url)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            cursor = self._db.execute(f"DELETE FROM results{where}", params)
+            self._db.commit()
+        return cursor.rowcount
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            count, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+            models = dict(self._db.execute("SELECT model, COUNT(*) FROM results GROUP BY model").fetchall())
+        return {"entries": count, "bytes": size, "max_bytes": self.max_bytes, "models": models}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+        logging.info(
+            f"Extraction cache: {self.stats['hits']} hits, {self.stats['misses']} misses, "
+            f"{self.stats['stores']} stored, {self.stats['evictions']} evicted"
+        )
+
+    def __enter__(self) -> "ExtractionCache":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or invalidate the LLM extraction cache.")
+    parser.add_argument("cache", help="Path to the cache database (e.g. .scraper_cache/llm_cache.db)")
+    parser.add_argument("command", choices=["stats", "invalidate"])
+    parser.add_argument("--model", help="Only invalidate results produced by this model")
+    parser.add_argument("--url", help="Only invalidate results for this URL")
+    args = parser.parse_args()
+
+    with ExtractionCache(args.cache) as cache:
+        if args.command == "stats":
+            print(json.dumps(cache.summary(), indent=4))
+        else:
+            removed = cache.invalidate(model=args.model, url=args.url)
+            print(f"Removed {removed} cached results from {args.cache}")
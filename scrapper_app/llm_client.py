@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+from background_loop import BackgroundLoop
+
+
+class Completion:
+    """Reply text of a chat completion plus what the rate-limit scheduler needs from it."""
+
+    def __init__(self, content: str, headers: Dict[str, str], total_tokens: Optional[int],
+                 prompt_tokens: Optional[int] = None, completion_tokens: Optional[int] = None):
+        self.content = content
+        self.headers = headers
+        self.total_tokens = total_tokens
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+
+class MissingApiKey(ValueError):
+    """Raised on the first model request when the client was given no API key."""
+
+
+class AsyncLlmClient:
+    """Shared async client for an OpenAI-compatible chat completions API.
+
+    One ``AsyncOpenAI`` client, and so one keep-alive connection pool, serves
+    every request. At most ``max_concurrency`` requests are in flight and each
+    one is abandoned after ``timeout`` seconds. Use ``acomplete`` from async
+    code, or ``complete`` from the threaded crawl stages, which runs on the
+    shared BackgroundLoop. The client and loop are created on first use and
+    recreated if used again after ``close``.
+
+    SDK retries are disabled so that rate-limit errors reach the caller. A
+    missing ``api_key`` raises ``MissingApiKey`` on first use; ``AsyncOpenAI``
+    would otherwise fall back to ``OPENAI_API_KEY`` and send that key to
+    ``base_url``.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: str,
+        max_concurrency: int = 4,
+        timeout: float = 60,
+        loop: Optional[BackgroundLoop] = None,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._owns_loop = loop is None
+        self.loop = loop
+        self._client: Optional[AsyncOpenAI] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "in_flight": 0, "max_in_flight": 0}
+
+    def _get_loop(self) -> BackgroundLoop:
+        with self._lock:
+            if self.loop is None or self.loop.loop.is_closed():
+                self.loop = BackgroundLoop()
+                self._owns_loop = True
+            return self.loop
+
+    def _get_client(self) -> AsyncOpenAI:
+        if self._client is None:
+            if not self.api_key:
+                raise MissingApiKey(f"No API key configured for {self.base_url}")
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=self.timeout,
+                max_retries=0,
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency
+                    ),
+                    timeout=self.timeout,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def acomplete(self, messages: List[Dict[str, str]], model: str, **params: Any) -> Completion:
+        """Send one chat completion request; API errors (including 429s) are raised unchanged."""
+        client = self._get_client()
+        async with self._semaphore:
+            self.stats["requests"] += 1
+            self.stats["in_flight"] += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+            try:
+                raw_response = await client.chat.completions.with_raw_response.create(
+                    model=model, messages=messages, **params
+                )
+            except Exception:
+                self.stats["errors"] += 1
+                raise
+            finally:
+                self.stats["in_flight"] -= 1
+        completion = raw_response.parse()
+        usage = getattr(completion, "usage", None)
+        return Completion(
+            completion.choices[0].message.content or "",
+            dict(raw_response.headers),
+            usage.total_tokens if usage else None,
+            usage.prompt_tokens if usage else None,
+            usage.completion_tokens if usage else None,
+        )
+
+    def complete(self, messages: List[Dict[str, str]], model: str, **params: Any) -> Completion:
+        """Blocking wrapper around ``acomplete`` for use from worker threads."""
+        return self._get_loop().run(self.acomplete(messages, model, **params))
+
+    async def _close_client(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    def close(self) -> None:
+        """Close the connection pool (and the loop, if this client started it)."""
+        if self.loop is None or self.loop.loop.is_closed():
+            return
+        self.loop.run(self._close_client())
+        if self._owns_loop:
+            self.loop.close()
+        logging.info(
+            f"LLM client: {self.stats['requests']} requests, {self.stats['errors']} errors, "
+            f"at most {self.stats['max_in_flight']} in flight"
+        )
+
+    def __enter__(self) -> "AsyncLlmClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,168 @@
+import re
+import time
+import threading
+import logging
+from typing import Dict, List, Mapping, Optional
+
+from tokens import count_tokens
+
+_DURATION_PART = re.compile(r"([\d.]+)(ms|h|m|s)")
+_LIMIT_DETAILS = re.compile(r"\((RPM|RPD|TPM|TPD)\): Limit (\d+), Used (\d+), Requested (\d+)")
+_RETRY_IN = re.compile(r"try again in ((?:[\d.]+(?:ms|h|m|s))+)")
+
+
+def parse_duration(text: str) -> Optional[float]:
+    """Parse Groq-style durations such as ``5m51.955s``, ``7.66s`` or ``120ms`` into seconds."""
+    if not text:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(text)
+    if not parts:
+        return None
+    scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+    return sum(float(value) * scale[unit] for value, unit in parts)
+
+
+class RateLimitDeferred(Exception):
+    """Raised when a request could only be sent after waiting longer than allowed."""
+
+    def __init__(self, wait: float, limit: str):
+        super().__init__(f"{limit} budget exhausted for another {wait:.0f}s")
+        self.wait = wait
+        self.limit = limit
+
+
+class TokenBucket:
+    """Continuously refilling budget of ``capacity`` units per ``period`` seconds."""
+
+    def __init__(self, capacity: float, period: float):
+        self.capacity = capacity
+        self.period = period
+        self.rate = capacity / period
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` units are available (assumes ``refill`` was just called)."""
+        if amount > self.capacity:
+            amount = self.capacity  # Never wait for more than a full bucket
+        return max(amount - self.tokens, 0) / self.rate
+
+
+class LlmRateScheduler:
+    """Token-bucket scheduler that keeps LLM requests within the provider's rate limits.
+
+    Tracks requests and tokens per minute and per day. The buckets start at
+    the configured limits and are corrected from ``x-ratelimit-*`` response
+    headers and from the "Limit/Used/Requested ... try again in" details of
+    429 error bodies. ``acquire`` blocks until a request fits. Waiting
+    requests are admitted as soon as their own size fits, so smaller requests
+    can overtake a large one that is still waiting. A request that would have
+    to wait longer than ``max_wait`` raises RateLimitDeferred, so the caller
+    can defer it instead of burning retries.
+    """
+
+    def __init__(self, rpm: int, rpd: int, tpm: int, tpd: int, max_wait: float = 600,
+                 completion_tokens: int = 512):
+        self.buckets = {
+            "RPM": TokenBucket(rpm, 60),
+            "RPD": TokenBucket(rpd, 86400),
+            "TPM": TokenBucket(tpm, 60),
+            "TPD": TokenBucket(tpd, 86400),
+        }
+        self.max_wait = max_wait
+        self.completion_tokens = completion_tokens
+        self._cond = threading.Condition()
+        self.stats = {"requests": 0, "waits": 0, "wait_seconds": 0.0, "deferred": 0, "rate_limited": 0}
+
+    def estimate_tokens(self, messages: List[Dict[str, str]], pages: int = 1) -> int:
+        """Estimate the tokens a request will use: prompt tokens plus the expected completion for ``pages`` pages."""
+        text = "\n".join(m["content"] for m in messages)
+        return count_tokens(text) + self.completion_tokens * pages
+
+    def _wait_time(self, tokens: int):
+        now = time.monotonic()
+        waits = []
+        for name, bucket in self.buckets.items():
+            bucket.refill(now)
+            amount = 1 if name.startswith("R") else tokens
+            waits.append((bucket.wait_time(amount), name))
+        return max(waits)
+
+    def acquire(self, tokens: int) -> float:
+        """Block until a request of ``tokens`` fits every budget; returns the seconds waited."""
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                wait, limit = self._wait_time(tokens)
+                if wait <= 0:
+                    for name, bucket in self.buckets.items():
+                        bucket.tokens -= 1 if name.startswith("R") else tokens
+                    waited = time.monotonic() - started
+                    self.stats["requests"] += 1
+                    if waited > 0.01:
+                        self.stats["waits"] += 1
+                        self.stats["wait_seconds"] += waited
+                    return waited
+                if wait > self.max_wait:
+                    self.stats["deferred"] += 1
+                    raise RateLimitDeferred(wait, limit)
+                logging.info(f"Waiting {wait:.1f}s for {limit} budget ({tokens} tokens)")
+                self._cond.wait(min(wait, 5))
+
+    def record_usage(self, estimated: int, actual: Optional[int]) -> None:
+        """Correct the token buckets once the real usage of a request is known."""
+        if actual is None:
+            return
+        with self._cond:
+            for name in ("TPM", "TPD"):
+                self.buckets[name].tokens += estimated - actual
+            self._cond.notify_all()
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Sync the buckets with Groq's headers (``requests`` are per day, ``tokens`` per minute)."""
+        with self._cond:
+            for header, name in (("requests", "RPD"), ("tokens", "TPM")):
+                remaining = headers.get(f"x-ratelimit-remaining-{header}")
+                if remaining is None:
+                    continue
+                try:
+                    bucket = self.buckets[name]
+                    bucket.refill(time.monotonic())
+                    bucket.tokens = min(bucket.tokens, float(remaining))
+                except ValueError:
+                    continue
+            self._cond.notify_all()
+
+    def update_from_error(self, message: str, headers: Optional[Mapping[str, str]] = None) -> None:
+        """Apply a 429: drain the exhausted bucket so it refills exactly when the provider says."""
+        retry_in = _RETRY_IN.search(message or "")
+        wait = parse_duration(retry_in.group(1)) if retry_in else None
+        if wait is None and headers:
+            wait = parse_duration(headers.get("retry-after"))
+        details = _LIMIT_DETAILS.search(message or "")
+        with self._cond:
+            self.stats["rate_limited"] += 1
+            now = time.monotonic()
+            if details:
+                name, limit, _, requested = details.groups()
+                bucket = self.buckets[name]
+                bucket.capacity = float(limit)
+                bucket.rate = bucket.capacity / bucket.period
+                requested = 1 if name.startswith("R") else float(requested)
+            else:
+                name, bucket, requested = "RPM", self.buckets["RPM"], 1
+            bucket.refill(now)
+            if wait is not None:
+                bucket.tokens = min(requested, bucket.capacity) - wait * bucket.rate
+            else:
+                bucket.tokens = min(bucket.tokens, 0)
+            logging.info(f"Rate limited on {name}; next request in {wait if wait is not None else 'unknown'}s")
+            self._cond.notify_all()
@@ -0,0 +1,132 @@
+import re
+import threading
+import hashlib
+from typing import Any, Dict, List, Tuple
+
+from section_extractor import FIELD_SECTIONS, split_sections
+from tokens import count_tokens, get_encoding
+
+_WORD = re.compile(r"[a-z]{3,}")
+
+
+class MarkdownCompactor:
+    """Shrink page markdown to a token budget before it is sent to the model.
+
+    Outside the sections that back a field, lines that recur on at least
+    ``boilerplate_ratio`` of the pages seen so far (navigation, footers,
+    banners) are dropped once ``min_pages`` pages have been observed. The
+    remaining sections are ranked by relevance to the requested fields:
+    sections that back a field first, then the title block, then the rest by
+    word overlap with the field names. They are added in that order until
+    ``token_budget`` is used up, and the kept sections are emitted in their
+    original page order.
+    """
+
+    def __init__(self, token_budget: int = 3500, min_pages: int = 5, boilerplate_ratio: float = 0.6,
+                 max_tracked_lines: int = 200000):
+        self.token_budget = token_budget
+        self.min_pages = min_pages
+        self.boilerplate_ratio = boilerplate_ratio
+        self.max_tracked_lines = max_tracked_lines
+        self._line_pages: Dict[str, int] = {}
+        self._pages = 0
+        self._lock = threading.Lock()
+        self.stats = {"pages": 0, "tokens_before": 0, "tokens_after": 0}
+
+    def count_tokens(self, text: str) -> int:
+        return count_tokens(text)
+
+    def _truncate(self, text: str, tokens: int) -> str:
+        encoding = get_encoding()
+        return text[:tokens * 4] if encoding is None else encoding.decode(encoding.encode(text)[:tokens])
+
+    @staticmethod
+    def _line_key(line: str) -> str:
+        normalized = re.sub(r"\s+", " ", line).strip().lower()
+        return hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).hexdigest() if normalized else ""
+
+    def observe(self, markdown: str) -> None:
+        """Count which lines this page shares with earlier pages."""
+        keys = {self._line_key(line) for line in markdown.splitlines()} - {""}
+        with self._lock:
+            self._pages += 1
+            for key in keys:
+                self._line_pages[key] = self._line_pages.get(key, 0) + 1
+            if len(self._line_pages) > self.max_tracked_lines:
+                # Forget lines only ever seen once; they cannot be boilerplate yet
+                self._line_pages = {k: v for k, v in self._line_pages.items() if v > 1}
+
+    def _is_boilerplate(self, line: str) -> bool:
+        if self._pages < self.min_pages:
+            return False
+        count = self._line_pages.get(self._line_key(line), 0)
+        return count >= self.min_pages and count / self._pages >= self.boilerplate_ratio
+
+    def _strip_boilerplate(self, lines: List[str]) -> Tuple[List[str], int]:
+        with self._lock:
+            kept = [line for line in lines if not line.strip() or not self._is_boilerplate(line)]
+        return kept, len(lines) - len(kept)
+
+    def compact(self, markdown: str, fields: List[str], observe: bool = True) -> Tuple[str, Dict[str, Any]]:
+        """Return the compacted markdown and a report of what was removed and the tokens saved.
+
+        Pass ``observe=False`` when ``markdown`` is an excerpt of a page whose
+        full markdown was already given to ``observe``.
+        """
+        if observe:
+            self.observe(markdown)
+        tokens_before = self.count_tokens(markdown)
+        preamble, sections = split_sections(markdown)
+
+        blocks = [("Title", preamble)] + list(sections.items())
+        relevant = {name for field in fields for name in FIELD_SECTIONS.get(field, [])}
+        field_words = set(_WORD.findall(" ".join(fields).lower()))
+        ranked = []
+        boilerplate_lines = 0
+        for order, (name, lines) in enumerate(blocks):
+            # Field sections are kept verbatim: short lines such as "Aadhaar Card"
+            # recur across many pages but are still content there
+            if name not in relevant:
+                lines, removed = self._strip_boilerplate(lines)
+                boilerplate_lines += removed
+            text = "\n".join(lines).strip()
+            if not text:
+                continue
+            if name != "Title":
+                text = f"## {name}\n{text}"
+            if name in relevant:
+                score = 2.0
+            elif name == "Title":
+                score = 1.5
+            else:
+                words = set(_WORD.findall(text.lower()))
+                score = len(words & field_words) / (len(field_words) or 1)
+            ranked.append((score, order, name, text))
+
+        budget = self.token_budget
+        kept, dropped = [], []
+        for score, order, name, text in sorted(ranked, key=lambda r: (-r[0], r[1])):
+            tokens = self.count_tokens(text)
+            if tokens <= budget:
+                kept.append((order, text))
+                budget -= tokens
+            elif budget > 50:
+                kept.append((order, self._truncate(text, budget)))
+                budget = 0
+                dropped.append(f"{name} (truncated)")
+            else:
+                dropped.append(name)
+
+        compacted = "\n\n".join(text for _, text in sorted(kept))
+        tokens_after = self.count_tokens(compacted)
+        with self._lock:
+            self.stats["pages"] += 1
+            self.stats["tokens_before"] += tokens_before
+            self.stats["tokens_after"] += tokens_after
+        return compacted, {
+            "tokens_before": tokens_before,
+            "tokens_after": tokens_after,
+            "tokens_saved": tokens_before - tokens_after,
+            "boilerplate_lines": boilerplate_lines,
+            "dropped_sections": dropped,
+        }
@@ -0,0 +1,113 @@
+import os
+import sys
+import glob
+import time
+import logging
+import argparse
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List
+
+from html_markdown import html_to_markdown
+
+
+def _convert_chunk(pages: List[str]) -> List[str]:
+    return [html_to_markdown(page) for page in pages]
+
+
+class MarkdownPool:
+    """Run ``html_to_markdown`` in a pool of worker processes.
+
+    Pages are sent to the workers in chunks of ``chunk_size`` to amortize
+    the cost of pickling, and results always come back in input order.
+    ``convert`` splits a small batch into smaller chunks so that it still
+    keeps every worker busy.
+    Workers are started with ``spawn`` rather than forked, so they do not
+    inherit the crawler's threads, locks and browser pipes.
+    """
+
+    def __init__(self, workers: int = None, chunk_size: int = 8):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self._lock = threading.Lock()
+        self.stats = {"pages": 0, "chunks": 0, "seconds": 0.0}
+
+    def _chunks(self, pages: Iterable[str], chunk_size: int) -> Iterator[List[str]]:
+        chunk = []
+        for page in pages:
+            chunk.append(page)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def convert_iter(self, pages: Iterable[str], chunk_size: int = None) -> Iterator[str]:
+        """Convert pages lazily, keeping at most two chunks per worker in flight."""
+        started = time.perf_counter()
+        in_flight = deque()
+        for chunk in self._chunks(pages, chunk_size or self.chunk_size):
+            in_flight.append(self._executor.submit(_convert_chunk, chunk))
+            if len(in_flight) >= 2 * self.workers:
+                yield from self._collect(in_flight.popleft())
+        while in_flight:
+            yield from self._collect(in_flight.popleft())
+        with self._lock:
+            self.stats["seconds"] += time.perf_counter() - started
+
+    def _collect(self, future) -> List[str]:
+        results = future.result()
+        with self._lock:
+            self.stats["pages"] += len(results)
+            self.stats["chunks"] += 1
+        return results
+
+    def convert(self, pages: List[str]) -> List[str]:
+        """Convert a batch of pages; blocks until all are done."""
+        # A batch of chunk_size pages would otherwise occupy a single worker
+        share = -(-len(pages) // self.workers)
+        return list(self.convert_iter(pages, max(1, min(self.chunk_size, share))))
+
+    def close(self) -> None:
+        self._executor.shutdown()
+        logging.info(
+            f"Markdown pool: {self.stats['pages']} pages in {self.stats['chunks']} chunks "
+            f"on {self.workers} processes"
+        )
+
+    def __enter__(self) -> "MarkdownPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def _read(path: str) -> str:
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a directory of archived HTML pages to markdown.")
+    parser.add_argument("html_dir", help="Directory of .html files")
+    parser.add_argument("out_dir", help="Where to write the .md files")
+    parser.add_argument("--workers", type=int, default=None, help="Processes to use (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=8, help="Pages sent to a worker at a time")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    paths = sorted(glob.glob(os.path.join(args.html_dir, "*.html")))
+    if not paths:
+        sys.exit(f"No .html files in {args.html_dir}")
+    os.makedirs(args.out_dir, exist_ok=True)
+    started = time.perf_counter()
+    with MarkdownPool(args.workers, args.chunk_size) as pool:
+        for path, markdown in zip(paths, pool.convert_iter(_read(path) for path in paths)):
+            name = os.path.splitext(os.path.basename(path))[0]
+            with open(os.path.join(args.out_dir, f"{name}.md"), "w", encoding="utf-8") as f:
+                f.write(markdown)
+    elapsed = time.perf_counter() - started
+    print(f"Converted {len(paths)} pages in {elapsed:.1f}s ({len(paths) / elapsed:.1f} pages/s)")
@@ -0,0 +1,192 @@
+import json
+import time
+import random
+import threading
+import logging
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+from json_stream import iter_array
+
+
+def load_catalog_items(paths: List[str]) -> List[Dict[str, Any]]:
+    """Unique search API items from saved catalog dumps such as ``urls/all.json``."""
+    items = {}
+    for path in paths:
+        with open(path, "rb") as f:
+            for response in iter_array(f):
+                for item in response.get("data", {}).get("hits", {}).get("items", []):
+                    slug = item.get("fields", {}).get("slug")
+                    if slug:
+                        items.setdefault(slug, item)
+    return list(items.values())
+
+
+def synthetic_items(count: int, start: int = 0) -> List[Dict[str, Any]]:
+    """Placeholder items to pad a catalog out to a realistic size."""
+    return [
+        {"id": f"mock-{n}", "fields": {"slug": f"mock-scheme-{n}", "schemeName": f"Mock Scheme {n}"}, "highlight": {}}
+        for n in range(start, start + count)
+    ]
+
+
+class MockCatalogHandler(BaseHTTPRequestHandler):
+    """Answer ``GET .../schemes?from=&size=`` like the myscheme search API.
+
+    Items are sorted by scheme name. A ``failure_rate`` share of requests
+    gets a 503, and requests beyond ``rps`` per second get a 429 with
+    ``Retry-After``.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if not url.path.rstrip("/").endswith("/schemes"):
+            self._send(404, {"status": "Failed", "errorDescription": f"Unknown path {url.path}"})
+            return
+        server = self.server
+        query = parse_qs(url.query)
+        start = int(query.get("from", ["0"])[0])
+        size = int(query.get("size", ["10"])[0])
+        with server.lock:
+            server.requests += 1
+            now = time.monotonic()
+            server.recent = [t for t in server.recent if now - t < 1.0]
+            limited = server.rps and len(server.recent) >= server.rps
+            if not limited:
+                server.recent.append(now)
+            failed = not limited and random.random() < server.failure_rate
+            if limited:
+                server.rate_limited += 1
+            if failed:
+                server.failures += 1
+            items = sorted(server.items, key=lambda item: item["fields"].get("schemeName") or "")
+        if limited:
+            self._send(429, {"status": "Failed", "errorDescription": "Too many requests"}, {"Retry-After": "1"})
+            return
+        if failed:
+            self._send(503, {"status": "Failed", "errorDescription": "Service unavailable"})
+            return
+        time.sleep(server.latency)
+        total = len(items)
+        self._send(200, {
+            "status": "Success",
+            "statusCode": 200,
+            "errorDescription": "",
+            "error": "null",
+            "data": {
+                "summary": {"total": total, "query": ""},
+                "hits": {
+                    "items": items[start:start + size],
+                    "page": {
+                        "total": total,
+                        "totalPages": (total + size - 1) // size,
+                        "pageNumber": start // size,
+                        "from": start,
+                        "size": size,
+                    },
+                },
+            },
+        })
+
+    def _send(self, status: int, payload: dict, headers: dict = None) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args) -> None:
+        logging.debug(f"Mock catalog server: {format % args}")
+
+
+class MockCatalogServer:
+    """Local stand-in for the scheme search API, run on a background thread.
+
+    ``items`` can be changed between enumerations to simulate schemes being
+    added or withdrawn. ``requests``, ``rate_limited`` and ``failures``
+    record the load the server saw.
+    """
+
+    def __init__(self, items: List[Dict[str, Any]], host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, rps: int = None, failure_rate: float = 0.0, handler=MockCatalogHandler):
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.httpd.items = list(items)
+        self.httpd.latency = latency
+        self.httpd.rps = rps
+        self.httpd.failure_rate = failure_rate
+        self.httpd.recent = []
+        self.httpd.lock = threading.Lock()
+        self.httpd.requests = 0
+        self.httpd.rate_limited = 0
+        self.httpd.failures = 0
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def api_url(self) -> str:
+        """URL to pass to ``CatalogEnumerator``."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/search/v4/schemes"
+
+    @property
+    def items(self) -> List[Dict[str, Any]]:
+        return self.httpd.items
+
+    @items.setter
+    def items(self, items: List[Dict[str, Any]]) -> None:
+        with self.httpd.lock:
+            self.httpd.items = list(items)
+
+    @property
+    def requests(self) -> int:
+        return self.httpd.requests
+
+    @property
+    def rate_limited(self) -> int:
+        return self.httpd.rate_limited
+
+    @property
+    def failures(self) -> int:
+        return self.httpd.failures
+
+    def start(self) -> "MockCatalogServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "MockCatalogServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve saved catalog dumps like the scheme search API.")
+    parser.add_argument("catalogs", nargs="+", help="Saved search API dumps, e.g. urls/all.json")
+    parser.add_argument("--total", type=int, help="Pad the catalog with synthetic schemes up to this size")
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--rps", type=int, help="Requests per second before 429s")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of requests answered with a 503")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG)
+    items = load_catalog_items(args.catalogs)
+    if args.total and args.total > len(items):
+        items += synthetic_items(args.total - len(items))
+    server = MockCatalogServer(items, port=args.port, rps=args.rps, failure_rate=args.failure_rate)
+    print(f"Mock search API with {len(items)} schemes at {server.api_url} (set CATALOG_API_URL to use it)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
@@ -0,0 +1,193 @@
+import re
+import sys
+import json
+import time
+import threading
+import logging
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_PAGE = re.compile(r"^=== PAGE \d+ \| URL: (\S+) ===$", re.M)
+_TITLE = re.compile(r"^#\s+(.+)$", re.M)
+
+
+def fake_listing(content: str) -> dict:
+    """A plausible listing for a page: its first top-level heading as the scheme name."""
+    title = _TITLE.search(content)
+    return {"Scheme Name": title.group(1).strip() if title else None, "Tags": "mock"}
+
+
+class MockLlmHandler(BaseHTTPRequestHandler):
+    """Answer ``POST .../chat/completions`` like an OpenAI-compatible API.
+
+    Single-page prompts get ``{"listings": [...]}``; prompts with
+    ``=== PAGE n | URL: ... ===`` markers get one batched result per page.
+    Requests over the server's per-minute limits get a Groq-style 429.
+    """
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, so clients can reuse connections
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        server = self.server
+        prompt_tokens = sum(len(m["content"]) for m in body["messages"]) // 4
+        with server.lock:
+            server.requests += 1
+            limited = self._rate_limit(server, prompt_tokens + 50)
+            if limited is None:
+                server.in_flight += 1
+                server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        if limited is not None:
+            self._send(429, {"error": {"message": limited[0], "type": "tokens", "code": "rate_limit_exceeded"}},
+                       {"retry-after": str(int(limited[1]) + 1)})
+            return
+        try:
+            time.sleep(server.latency)
+            content = body["messages"][-1]["content"]
+            urls = _PAGE.findall(content)
+            if urls:
+                pages = _PAGE.split(content)[2::2]
+                reply = {"results": [{"URL": url, "listings": [fake_listing(page)]}
+                                     for url, page in zip(urls, pages)]}
+            else:
+                reply = {"listings": [fake_listing(content)]}
+            self._send(200, {
+                "id": f"mock-{server.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "mock"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": json.dumps(reply)},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": 50,
+                          "total_tokens": prompt_tokens + 50},
+            }, self._limit_headers(server))
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    @staticmethod
+    def _rate_limit(server, tokens: int):
+        """Record a request in the last-minute window, or return (message, wait) if it is over a limit."""
+        now = time.monotonic()
+        while server.window and now - server.window[0][0] >= 60:
+            server.window.popleft()
+        used_requests = len(server.window)
+        used_tokens = sum(t for _, t in server.window)
+        for name, limit, used, requested in (("RPM", server.rpm, used_requests, 1),
+                                             ("TPM", server.tpm, used_tokens, tokens)):
+            if limit and used + requested > limit:
+                wait = 60 - (now - server.window[0][0]) if server.window else 1.0
+                server.rate_limited += 1
+                kind = "requests" if name == "RPM" else "tokens"
+                return (f"Rate limit reached for model `mock` in organization `org_mock` on {kind} per minute "
+                        f"({name}): Limit {limit}, Used {used}, Requested {requested}. "
+                        f"Please try again in {wait:.3f}s.", wait)
+        server.window.append((now, tokens))
+        return None
+
+    @staticmethod
+    def _limit_headers(server) -> dict:
+        with server.lock:
+            headers = {}
+            if server.rpm:
+                headers["x-ratelimit-limit-requests"] = str(server.rpm)
+                headers["x-ratelimit-remaining-requests"] = str(max(server.rpm - len(server.window), 0))
+            if server.tpm:
+                headers["x-ratelimit-limit-tokens"] = str(server.tpm)
+                headers["x-ratelimit-remaining-tokens"] = str(max(server.tpm - sum(t for _, t in server.window), 0))
+        return headers
+
+    def _send(self, status: int, payload: dict, headers: dict = None) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args) -> None:
+        logging.debug(f"Mock LLM server: {format % args}")
+
+
+class MockLlmServer:
+    """Local OpenAI-compatible chat completions server, run on a background thread.
+
+    Every reply is delayed by ``latency`` seconds. With ``rpm`` or ``tpm``
+    set, requests beyond that many requests or tokens in the last minute are
+    rejected with a 429 whose body has the same "Limit/Used/Requested ...
+    try again in" details as Groq's. ``requests``, ``rate_limited`` and
+    ``max_in_flight`` record the load the server saw.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 rpm: int = None, tpm: int = None, handler=MockLlmHandler):
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.rpm = rpm
+        self.httpd.tpm = tpm
+        self.httpd.window = deque()
+        self.httpd.rate_limited = 0
+        self.httpd.lock = threading.Lock()
+        self.httpd.requests = 0
+        self.httpd.in_flight = 0
+        self.httpd.max_in_flight = 0
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to pass to an OpenAI-compatible client."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def requests(self) -> int:
+        return self.httpd.requests
+
+    @property
+    def rate_limited(self) -> int:
+        return self.httpd.rate_limited
+
+    @property
+    def max_in_flight(self) -> int:
+        return self.httpd.max_in_flight
+
+    def start(self) -> "MockLlmServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "MockLlmServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 5:
+        print("Usage: python mock_llm_server.py [port] [latency_seconds] [rpm] [tpm]")
+    else:
+        logging.basicConfig(level=logging.DEBUG)
+        server = MockLlmServer(
+            port=int(sys.argv[1]) if len(sys.argv) > 1 else 8766,
+            latency=float(sys.argv[2]) if len(sys.argv) > 2 else 0.0,
+            rpm=int(sys.argv[3]) if len(sys.argv) > 3 else None,
+            tpm=int(sys.argv[4]) if len(sys.argv) > 4 else None,
+        )
+        print(f"Mock chat completions API at {server.base_url} (set LLM_BASE_URL to use it)")
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            server.httpd.server_close()
@@ -0,0 +1,90 @@
+import time
+import logging
+from typing import Any, Dict, List
+
+from selenium import webdriver
+
+# Resolves once the page is ready, or when the budget runs out. The page counts
+# as ready when the DOM has stopped mutating for ``quietMs`` and either every
+# target section is visible inside <main> or no new network requests have
+# started for ``quietMs`` after the document finished loading.
+READY_SCRIPT = """
+const [sections, quietMs, budgetMs, done] = arguments;
+const started = performance.now();
+let lastMutation = started;
+let mutations = 0;
+const observer = new MutationObserver((records) => {
+    mutations += records.length;
+    lastMutation = performance.now();
+});
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+
+const lastRequest = () => {
+    const entries = performance.getEntriesByType("resource");
+    let latest = 0;
+    for (const entry of entries) {
+        latest = Math.max(latest, entry.startTime, entry.responseEnd);
+    }
+    return [latest, entries.length];
+};
+const sectionsPresent = () => {
+    if (!sections.length) return false;
+    const main = document.querySelector("main");
+    const text = main ? main.innerText.toLowerCase() : "";
+    return sections.every((s) => text.includes(s.toLowerCase()));
+};
+
+const finish = (reason) => {
+    observer.disconnect();
+    const [, resources] = lastRequest();
+    done({reason: reason, waitedMs: performance.now() - started, mutations: mutations, resources: resources});
+};
+const poll = () => {
+    const now = performance.now();
+    const domQuiet = now - lastMutation >= quietMs;
+    const [latest] = lastRequest();
+    const networkIdle = document.readyState === "complete" && now - latest >= quietMs;
+    if (domQuiet && sectionsPresent()) return finish("sections");
+    if (domQuiet && networkIdle) return finish("idle");
+    if (now - started >= budgetMs) return finish("budget");
+    setTimeout(poll, 50);
+};
+poll();
+"""
+
+
+def wait_for_page_ready(
+    driver: webdriver.Chrome,
+    sections: List[str],
+    budget: float,
+    quiet: float = 0.5,
+) -> Dict[str, Any]:
+    """Block until the page is quiescent (see READY_SCRIPT) or ``budget`` seconds pass.
+
+    Returns telemetry with the reason the wait ended, the seconds spent
+    waiting, and the number of DOM mutations and resources observed.
+    """
+    started = time.perf_counter()
+    budget = max(budget, 0)
+    try:
+        driver.set_script_timeout(budget + 5)
+        result = driver.execute_async_script(READY_SCRIPT, sections, quiet * 1000, budget * 1000)
+    except Exception as e:
+        logging.warning(f"Readiness check failed: {e}")
+        result = {"reason": "error", "mutations": 0, "resources": 0}
+    return {
+        "reason": result.get("reason"),
+        "waited": time.perf_counter() - started,
+        "mutations": result.get("mutations", 0),
+        "resources": result.get("resources", 0),
+    }
+
+
+class PageBudget:
+    """Per-page deadline shared by every wait while a page is loaded."""
+
+    def __init__(self, seconds: float):
+        self.deadline = time.perf_counter() + seconds
+
+    def remaining(self) -> float:
+        return max(self.deadline - time.perf_counter(), 0)
@@ -0,0 +1,132 @@
+import queue
+import threading
+import logging
+import time
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+# Marks the end of the stream on a stage's input queue (one per worker).
+_DONE = object()
+
+
+class Stage:
+    """One step of a StagedPipeline: ``func`` runs on ``workers`` threads.
+
+    ``func`` receives an item and returns the item to hand to the next stage,
+    or ``None`` to drop it (e.g. a page that could not be fetched). With a
+    ``batch_size`` above 1, ``func`` instead receives a list of up to that
+    many items (waiting at most ``batch_wait`` seconds to fill it) and returns
+    a list of results.
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Optional[Any]], workers: int = 1,
+                 batch_size: int = 1, batch_wait: float = 2.0):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait
+        self.processed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+
+
+class StagedPipeline:
+    """Run items through stages concurrently, each stage with its own worker pool.
+
+    Stages are connected by bounded queues, so a slow stage applies
+    backpressure upstream instead of letting work pile up in memory.
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 4):
+        if not stages:
+            raise ValueError("StagedPipeline needs at least one stage")
+        self.stages = stages
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+
+    def run(self, items: Iterable[Any]) -> None:
+        """Feed ``items`` through every stage and block until all of them are done."""
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        queues.append(None)  # The last stage has no downstream queue
+        threads = []
+        for index, stage in enumerate(self.stages):
+            remaining = [stage.workers]
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._work,
+                    args=(stage, queues[index], queues[index + 1], self.stages[index + 1:index + 2], remaining),
+                    name=f"{stage.name}-{n}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        for item in items:
+            queues[0].put(item)
+        for _ in range(self.stages[0].workers):
+            queues[0].put(_DONE)
+
+        for thread in threads:
+            thread.join()
+
+        for stage in self.stages:
+            logging.info(
+                f"Stage '{stage.name}' ({stage.workers} workers): {stage.processed} processed, "
+                f"{stage.dropped} dropped, {stage.failed} failed, {stage.busy_seconds:.1f}s busy"
+            )
+
+    def _next_batch(self, stage: Stage, inbox: queue.Queue) -> Tuple[List[Any], bool]:
+        """Take up to ``stage.batch_size`` items; the flag is set once the stream has ended."""
+        item = inbox.get()
+        if item is _DONE:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + stage.batch_wait
+        while len(batch) < stage.batch_size:
+            try:
+                item = inbox.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if item is _DONE:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _work(self, stage: Stage, inbox: queue.Queue, outbox: Optional[queue.Queue],
+              downstream: List[Stage], remaining: List[int]) -> None:
+        finished = False
+        while not finished:
+            batch, finished = self._next_batch(stage, inbox)
+            if not batch:
+                continue
+            started = time.perf_counter()
+            failed = False
+            try:
+                if stage.batch_size > 1:
+                    results = stage.func(batch)
+                else:
+                    results = [stage.func(batch[0])]
+            except Exception as e:
+                logging.error(f"Stage '{stage.name}' failed: {e}")
+                results = [None] * len(batch)
+                failed = True
+            with self._lock:
+                stage.busy_seconds += time.perf_counter() - started
+                stage.processed += len(batch)
+                if failed:
+                    stage.failed += len(batch)
+                else:
+                    stage.dropped += sum(1 for result in results if result is None)
+            if outbox is not None:
+                for result in results:
+                    if result is not None:
+                        outbox.put(result)
+
+        # The last worker of a stage to finish closes the next stage's input
+        with self._lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last and outbox is not None:
+            for _ in range(downstream[0].workers):
+                outbox.put(_DONE)
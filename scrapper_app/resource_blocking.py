@@ -0,0 +1,249 @@
+import json
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+from urllib.parse import urlparse
+
+import trio
+from selenium import webdriver
+
+
+def _extensions(*names: str) -> List[str]:
+    """Wildcards matching each extension in both cases, bare or followed by a query."""
+    return [pattern for name in names for ext in (name, name.upper()) for pattern in (f"*.{ext}", f"*.{ext}?*")]
+
+
+# Fallback URL patterns (Network.setBlockedURLs wildcards) for each blockable
+# resource type, used only when a driver's requests cannot be intercepted.
+# They can only guess the type from the URL.
+RESOURCE_TYPE_PATTERNS = {
+    "Image": _extensions("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico")
+    + ["*/_next/image?*", "*/_next/image/*"],
+    "Font": _extensions("woff", "woff2", "ttf", "otf", "eot") + ["*://fonts.gstatic.com/*"],
+    "Stylesheet": _extensions("css") + ["*://fonts.googleapis.com/css*"],
+    "Media": _extensions("mp4", "webm", "mp3", "m3u8"),
+}
+
+# Paused requests waiting to be answered; a full channel drops events (and stalls the request)
+_PAUSED_BUFFER = 1024
+
+# Seconds to wait for a driver's interception to be in place before falling back to patterns
+_INTERCEPT_START_TIMEOUT = 10
+
+# Analytics, tag managers and embeds that never contribute to <main>
+THIRD_PARTY_HOSTS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "connect.facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "youtube.com",
+    "ytimg.com",
+]
+
+# Resource types a learned third-party host may have served and still be blocked;
+# hosts that served scripts or API calls are left alone in case the page needs them
+_LEARNABLE_TYPES = {"Image", "Font", "Stylesheet", "Media", "Ping", "Manifest", "TextTrack"}
+
+
+def _host_matches(host: str, domains: Iterable[str]) -> bool:
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+class _Interceptor(threading.Thread):
+    """Fail one driver's requests of the blocked resource types as Chrome pauses them.
+
+    Runs a trio loop with its own CDP connection (``driver.bidi_connection``)
+    and ``Fetch.enable`` patterns that pause only the blocked types, so other
+    requests never wait on Python. Requests to allowlisted hosts are
+    continued. The thread ends when the browser quits and closes the
+    connection.
+    """
+
+    def __init__(self, driver: webdriver.Chrome, blocker: "ResourceBlocker"):
+        super().__init__(name="resource-interceptor", daemon=True)
+        self.driver = driver
+        self.blocker = blocker
+        self.ready = threading.Event()
+        self.error: Optional[BaseException] = None
+
+    def run(self) -> None:
+        try:
+            trio.run(self._intercept)
+        except BaseException as e:
+            if self.ready.is_set():
+                logging.debug(f"Request interception ended: {e}")
+            else:
+                self.error = e
+        finally:
+            self.ready.set()
+
+    async def _intercept(self) -> None:
+        async with self.driver.bidi_connection() as connection:
+            session, devtools = connection.session, connection.devtools
+            fetch, network = devtools.fetch, devtools.network
+            await session.execute(fetch.enable(patterns=[
+                fetch.RequestPattern(url_pattern="*", resource_type=network.ResourceType(kind))
+                for kind in self.blocker.blocked_types
+            ]))
+            paused = session.listen(fetch.RequestPaused, buffer_size=_PAUSED_BUFFER)
+            self.ready.set()
+            async for event in paused:
+                host = urlparse(event.request.url).hostname or ""
+                if _host_matches(host, self.blocker.allowlist):
+                    await session.execute(fetch.continue_request(event.request_id))
+                else:
+                    await session.execute(fetch.fail_request(event.request_id, network.ErrorReason.BLOCKED_BY_CLIENT))
+
+
+class ResourceBlocker:
+    """Stop Chrome from downloading what the scraper never reads.
+
+    ``apply`` intercepts a driver's requests (CDP ``Fetch.requestPaused``)
+    and fails those whose resource type is in ``blocked_types``, as Chrome
+    reports it. It also blocks every request to ``blocked_hosts`` with
+    ``Network.setBlockedURLs``. If a driver's requests cannot be intercepted
+    (no CDP websocket), the types are approximated by the URL patterns in
+    ``RESOURCE_TYPE_PATTERNS``. With ``learn_hosts`` third-party hosts that
+    only served blockable types during a page load are added to the block
+    list for later pages.
+    ``allowlist`` holds resource type names and hosts (with their
+    subdomains) that are never blocked; ``first_party`` hosts are never
+    learned.
+
+    ``collect`` reads the page load's network events from Chrome's
+    performance log (enable it with ``capabilities``). It records the bytes
+    transferred, the request count and the number of blocked requests into a
+    telemetry dict.
+    """
+
+    def __init__(
+        self,
+        first_party: List[str],
+        blocked_types: List[str] = None,
+        blocked_hosts: List[str] = None,
+        allowlist: List[str] = None,
+        learn_hosts: bool = True,
+    ):
+        self.first_party = list(first_party)
+        self.allowlist = list(allowlist or [])
+        self.blocked_types = [t for t in (blocked_types if blocked_types is not None else RESOURCE_TYPE_PATTERNS)
+                              if t not in self.allowlist]
+        self.blocked_hosts: Set[str] = {h for h in (blocked_hosts if blocked_hosts is not None else THIRD_PARTY_HOSTS)
+                                        if not _host_matches(h, self.allowlist)}
+        self.learn_hosts = learn_hosts
+        self._lock = threading.Lock()
+        self._version = 0
+        self.stats = {"pages": 0, "bytes": 0, "requests": 0, "blocked": 0, "learned_hosts": 0}
+
+    @staticmethod
+    def capabilities() -> Dict[str, Any]:
+        """Driver capabilities that turn on the performance log ``collect`` reads."""
+        return {"goog:loggingPrefs": {"performance": "ALL"}}
+
+    def patterns(self, by_type: bool = False) -> List[str]:
+        """URL patterns for ``Network.setBlockedURLs``: the blocked hosts, plus the type fallbacks with ``by_type``."""
+        with self._lock:
+            hosts = sorted(self.blocked_hosts)
+        patterns = []
+        if by_type:
+            patterns = [pattern for kind in self.blocked_types for pattern in RESOURCE_TYPE_PATTERNS.get(kind, [])]
+        for host in hosts:
+            patterns += [f"*://{host}/*", f"*://*.{host}/*"]
+        return patterns
+
+    def apply(self, driver: webdriver.Chrome) -> None:
+        """Start intercepting ``driver``'s requests and install the current host block list.
+
+        Cheap to call before every page: interception starts once per
+        driver and the block list is only sent again after it changed.
+        """
+        if not hasattr(driver, "_resource_interceptor"):
+            driver._resource_interceptor = self._intercept(driver)
+        if getattr(driver, "_blocked_version", None) == self._version:
+            return
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd(
+            "Network.setBlockedURLs", {"urls": self.patterns(by_type=driver._resource_interceptor is None)}
+        )
+        driver._blocked_version = self._version
+
+    def _intercept(self, driver: webdriver.Chrome) -> Optional[_Interceptor]:
+        """Start an interceptor for ``driver``; ``None`` (use URL patterns) if it does not come up."""
+        if not self.blocked_types:
+            return None
+        interceptor = _Interceptor(driver, self)
+        interceptor.start()
+        if not interceptor.ready.wait(_INTERCEPT_START_TIMEOUT) or interceptor.error is not None:
+            logging.warning(
+                f"Cannot intercept requests ({interceptor.error or 'timed out'}); blocking resource types by URL"
+            )
+            return None
+        return interceptor
+
+    def reset_log(self, driver: webdriver.Chrome) -> None:
+        """Discard network events logged before the next page load."""
+        try:
+            driver.get_log("performance")
+        except Exception as e:
+            logging.debug(f"Performance log unavailable: {e}")
+
+    def collect(self, driver: webdriver.Chrome, page_url: str,
+                telemetry: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Summarize the network events logged since ``reset_log`` and learn new hosts.
+
+        The host of ``page_url`` counts as first-party for this page.
+        """
+        try:
+            entries = driver.get_log("performance")
+        except Exception as e:
+            logging.debug(f"Performance log unavailable: {e}")
+            return {}
+        hosts: Dict[str, Set[str]] = {}
+        transferred = requests = blocked = 0
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            method, params = message.get("method"), message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                requests += 1
+                kind = params.get("type", "Other")
+                host = urlparse(params["request"]["url"]).hostname
+                if host:
+                    hosts.setdefault(host, set()).add(kind)
+            elif method == "Network.loadingFinished":
+                transferred += int(params.get("encodedDataLength", 0))
+            elif method == "Network.loadingFailed" and (
+                params.get("blockedReason") or params.get("errorText") == "net::ERR_BLOCKED_BY_CLIENT"
+            ):
+                blocked += 1
+        result = {"bytes_transferred": transferred, "requests": requests, "requests_blocked": blocked}
+        if telemetry is not None:
+            telemetry.update(result)
+        if self.learn_hosts:
+            page_host = urlparse(page_url).hostname
+            self._learn({host: kinds for host, kinds in hosts.items() if host != page_host})
+        with self._lock:
+            self.stats["pages"] += 1
+            self.stats["bytes"] += transferred
+            self.stats["requests"] += requests
+            self.stats["blocked"] += blocked
+        return result
+
+    def _learn(self, hosts: Dict[str, Set[str]]) -> None:
+        with self._lock:
+            new = [
+                host for host, kinds in hosts.items()
+                if kinds <= _LEARNABLE_TYPES
+                and not _host_matches(host, self.first_party)
+                and not _host_matches(host, self.allowlist)
+                and not _host_matches(host, self.blocked_hosts)
+            ]
+            if new:
+                self.blocked_hosts.update(new)
+                self.stats["learned_hosts"] += len(new)
+                self._version += 1
+        if new:
+            logging.info(f"Blocking third-party hosts from now on: {', '.join(sorted(new))}")
@@ -0,0 +1,157 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Section headings used on every myscheme.gov.in scheme page, in page order.
+SECTION_TITLES = [
+    "Details",
+    "Benefits",
+    "Eligibility",
+    "Exclusions",
+    "Application Process",
+    "Documents Required",
+    "Frequently Asked Questions",
+    "Sources And References",
+    "Feedback",
+]
+
+# Which page sections answer each listing field.
+FIELD_SECTIONS = {
+    "Description & Benefits": ["Details", "Benefits"],
+    "Eligibility Criteria": ["Eligibility"],
+    "Application Process": ["Application Process"],
+    "Target Beneficiaries": ["Details", "Eligibility"],
+}
+
+# Buttons and links that sit next to the tags but are not tags
+NON_TAG_LABELS = {"check eligibility", "apply now", "apply", "share", "print", "login", "sign in", "sign up"}
+
+_TITLE_LOOKUP = {title.lower(): title for title in SECTION_TITLES}
+_MINISTRY = re.compile(r"\b(ministry|department|government|directorate|board|commission)\b", re.I)
+_MARKUP = re.compile(r"[#*_`>|]+")
+_BULLET = re.compile(r"^\s*[-+*]\s+")
+
+# Confidence of values guessed from page layout rather than found under a heading or
+# label. It is kept below the rule threshold in app.py, so the model is asked for them.
+GUESSED_CONFIDENCE = 0.4
+
+# "Target beneficiaries: Registered construction workers", or the label alone above a list
+_LABELLED = re.compile(r"^target beneficiar(?:y|ies)\s*:?\s*(?P<who>.*)$", re.I)
+_CRITERION_BREAK = re.compile(r"(?<=\.)\s+(?=\d{1,2}\.\s|[A-Z])")
+
+
+def _plain(line: str) -> str:
+    """Strip markdown decoration from one line."""
+    return _MARKUP.sub("", _BULLET.sub("", line)).strip()
+
+
+def _join(lines: List[str]) -> str:
+    return re.sub(r"\s+", " ", " ".join(_plain(line) for line in lines if _plain(line))).strip()
+
+
+def split_sections(markdown: str) -> Tuple[List[str], Dict[str, List[str]]]:
+    """Split page markdown into the lines before the first section and each section's lines.
+
+    Section titles also appear in the page's side navigation, so when a title
+    occurs more than once the occurrence with the most content is kept.
+    """
+    lines = markdown.splitlines()
+    marks = [(i, _TITLE_LOOKUP[_plain(line).lower()]) for i, line in enumerate(lines)
+             if _plain(line).lower() in _TITLE_LOOKUP]
+    preamble = lines[:marks[0][0]] if marks else lines
+    sections: Dict[str, List[str]] = {}
+    for n, (start, title) in enumerate(marks):
+        end = marks[n + 1][0] if n + 1 < len(marks) else len(lines)
+        body = [line for line in lines[start + 1:end] if line.strip()]
+        if len(_join(body)) > len(_join(sections.get(title, []))):
+            sections[title] = body
+    return preamble, sections
+
+
+def target_beneficiaries(sections: Dict[str, List[str]]) -> Tuple[Optional[str], float]:
+    """Who a scheme is for, from its Details/Benefits and Eligibility sections, with a confidence.
+
+    A "Target beneficiaries" label in those sections is taken at 0.9, with
+    the rest of its line or the lines listed under it. Failing that, the
+    first eligibility criterion is only a guess (``GUESSED_CONFIDENCE``) and
+    the field is left to the model.
+    """
+    for name in ("Details", "Benefits", "Eligibility"):
+        lines = sections.get(name, [])
+        for i, line in enumerate(lines):
+            labelled = _LABELLED.match(_plain(line))
+            if not labelled:
+                continue
+            who = labelled.group("who").strip(" .")
+            if not who:
+                # The label is a sub-heading: take the items up to the next heading
+                items = []
+                for item in lines[i + 1:]:
+                    if item.lstrip().startswith("#") or _plain(item).endswith(":"):
+                        break
+                    items.append(_plain(item))
+                who = "; ".join(item.rstrip(" .") for item in items if item)
+            if who:
+                return who, 0.9
+    eligibility = _join(sections.get("Eligibility", []))
+    if eligibility:
+        first = _CRITERION_BREAK.split(re.sub(r"^1\.\s*", "", eligibility))[0]
+        return first.rstrip(" ."), GUESSED_CONFIDENCE
+    return None, 0.0
+
+
+def extract_sections(markdown: str, fields: List[str]) -> Tuple[Dict[str, Optional[str]], Dict[str, float]]:
+    """Parse listing fields straight from scheme page markdown.
+
+    Returns the listing (``None`` for fields that could not be found) and a
+    confidence between 0 and 1 for each field.
+    """
+    preamble, sections = split_sections(markdown or "")
+    listing: Dict[str, Optional[str]] = {}
+    confidence: Dict[str, float] = {}
+
+    # The scheme name is the page's first top-level heading
+    title_index = next((i for i, line in enumerate(preamble) if re.match(r"^#\s+\S", line)), None)
+    if title_index is None:
+        title_index = next((i for i, line in enumerate(preamble) if re.match(r"^#{1,3}\s+\S", line)), None)
+
+    for field in fields:
+        value, score = None, 0.0
+        if field == "Scheme Name" and title_index is not None:
+            value = _plain(preamble[title_index])
+            # A lower-level heading is only a guess at the name
+            score = 0.9 if preamble[title_index].startswith("# ") else GUESSED_CONFIDENCE
+        elif field == "Ministries/Departments":
+            # The owning ministry or state is printed just above the scheme name
+            before = preamble[:title_index] if title_index is not None else preamble
+            candidates = [_plain(line) for line in before if _MINISTRY.search(line) and len(_plain(line)) < 150]
+            if candidates:
+                value, score = candidates[-1], 0.8
+        elif field == "Tags" and title_index is not None:
+            # Tags are the short labels between the scheme name and the first section
+            tags = [_plain(line) for line in preamble[title_index + 1:]
+                    if 0 < len(_plain(line)) <= 40 and _plain(line).lower() not in NON_TAG_LABELS]
+            if tags:
+                value, score = ", ".join(dict.fromkeys(tags)), GUESSED_CONFIDENCE
+        elif field == "Target Beneficiaries":
+            # No section of its own: derived from the sections that describe who qualifies
+            value, score = target_beneficiaries(sections)
+        elif field in FIELD_SECTIONS:
+            parts = [_join(sections[name]) for name in FIELD_SECTIONS[field] if sections.get(name)]
+            if parts:
+                value = " ".join(parts)
+                score = 0.9 if all(sections.get(name) for name in FIELD_SECTIONS[field]) else 0.7
+        listing[field] = value
+        confidence[field] = score
+    return listing, confidence
+
+
+def focus_markdown(markdown: str, fields: List[str]) -> str:
+    """Keep only the title block and the sections relevant to ``fields`` (whole page if none match)."""
+    preamble, sections = split_sections(markdown or "")
+    wanted = [name for field in fields for name in FIELD_SECTIONS.get(field, []) if sections.get(name)]
+    if not wanted:
+        return markdown
+    parts = ["\n".join(preamble)]
+    for name in dict.fromkeys(wanted):
+        parts.append(f"## {name}\n" + "\n".join(sections[name]))
+    return "\n\n".join(parts)
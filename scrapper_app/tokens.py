@@ -0,0 +1,31 @@
+import logging
+import threading
+from typing import Optional
+
+import tiktoken
+
+_lock = threading.Lock()
+_encoding = None  # Loaded on first use; False once loading failed
+
+
+def get_encoding() -> Optional[tiktoken.Encoding]:
+    """The cl100k_base tokenizer, or ``None`` if it is unavailable (e.g. offline).
+
+    Loading is only tried once per process, since each attempt can stall on a
+    download. Callers fall back to about 4 characters per token.
+    """
+    global _encoding
+    if _encoding is None:
+        with _lock:
+            if _encoding is None:
+                try:
+                    _encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception as e:
+                    logging.warning(f"Tokenizer unavailable, estimating 4 characters per token: {e}")
+                    _encoding = False
+    return _encoding or None
+
+
+def count_tokens(text: str) -> int:
+    encoding = get_encoding()
+    return len(encoding.encode(text)) if encoding else len(text) // 4